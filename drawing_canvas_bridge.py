@@ -5,6 +5,7 @@ This module provides integration between the FreeDrawingAgent and the drawing_ca
 """
 
 import time
+import queue
 import threading
 import imageio
 import numpy as np
@@ -13,12 +14,14 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.action_chains import ActionChains
+from selenium.common.exceptions import TimeoutException
 from free_drawing_agent import FreeDrawingAgent, DrawingInstruction
 import base64
 from PIL import Image, ImageDraw, ImageFont
 import io
 import os
 import json
+import shutil
 from datetime import datetime
 from dotenv import load_dotenv
 
@@ -32,25 +35,115 @@ class DrawingCanvasBridge:
     Now includes real-time video capture capabilities during the drawing process.
     """
 
-    def __init__(self, canvas_url: str = None, enable_video_capture: bool = False, capture_fps: int = 30):
+    # (title_font, text_font) for video overlays, loaded on first use
+    _fonts = None
+    # Height of the step overlay strip at the top of each video frame
+    OVERLAY_HEIGHT = 101
+    # Tuned (step_length, step_duration) playback parameters per brush
+    BRUSH_STROKE_PARAMS = {"fountain": (28, 70), "marker": (8, 20), "spray": (20, 50), "wiggle": (8, 20), "crayon": (8, 20)}
+    # Stroke playback routine shared by the playback scripts below. With no step delay it
+    # never awaits, so the whole stroke is drawn synchronously within the calling script.
+    _DRAW_STROKE_FN_JS = '''
+        function lerp(a, b, t) { return a + (b - a) * t; }
+
+        async function drawStroke(x_coords, y_coords, fixed_step_length, step_delay, brush) {
+            for (let i = 0; i < x_coords.length - 1; i++) {
+                const startX = x_coords[i];
+                const startY = y_coords[i];
+                const endX = x_coords[i+1];
+                const endY = y_coords[i+1];
+
+                // Calculate distance between this pair of points
+                const distance = Math.sqrt(Math.pow(endX - startX, 2) + Math.pow(endY - startY, 2));
+
+                // Calculate steps needed for this specific stroke
+                const steps_per_segment = Math.max(1, Math.floor(distance / fixed_step_length));
+
+                for (let s = 0; s <= steps_per_segment; s++) {
+                    const t = s / steps_per_segment;
+                    const interpX = lerp(startX, endX, t);
+                    const interpY = lerp(startY, endY, t);
+                    window.pmouseX = (s === 0) ? startX : window.mouseX;
+                    window.pmouseY = (s === 0) ? startY : window.mouseY;
+                    window.mouseX = interpX;
+                    window.mouseY = interpY;
+
+                    // Only call the brush if there is movement
+                    if ((window.mouseX !== window.pmouseX) || (window.mouseY !== window.pmouseY)) {
+                        if (typeof brush === 'function') {
+                            brush();
+                            window.__canvasDirty = true;
+                            window.__captureDirty = true;
+                        }
+                    }
+
+                    // Add delay between each point for smooth drawing
+                    if (step_delay > 0 && s < steps_per_segment) {
+                        await new Promise(resolve => setTimeout(resolve, step_delay));
+                    }
+                }
+            }
+        }
+    '''
+    # Single stroke playback; arguments are (x_coords, y_coords, step_length, step_duration, brush_type)
+    _STROKE_JS = _DRAW_STROKE_FN_JS + '''
+        window.__strokeDone = false;
+        drawStroke(arguments[0], arguments[1], arguments[2], arguments[3], window[arguments[4]])
+            .then(() => { window.__strokeDone = true; });
+    '''
+    # All strokes of an instruction in one synchronous call; arguments are ([[x_coords, y_coords], ...], step_length, brush_type)
+    _STROKE_BATCH_JS = _DRAW_STROKE_FN_JS + '''
+        const brush = window[arguments[2]];
+        for (const [x_coords, y_coords] of arguments[0]) {
+            drawStroke(x_coords, y_coords, arguments[1], 0, brush);
+        }
+    '''
+
+    def __init__(self, canvas_url: str = None, enable_video_capture: bool = False, capture_fps: int = 30,
+                 fast_playback: bool = False, reuse_unchanged_captures: bool = False):
         self.canvas_url = canvas_url or f"file://{os.path.abspath('drawing_canvas.html')}"
         self.driver = None
         self.canvas = None
         self.wait = None
+        # Opt-in: draw strokes without the per-brush step delay while no video is being recorded.
+        # Only safe if the page's brushes depend on the stroke geometry alone, not on timing.
+        self.fast_playback = fast_playback
+        # Opt-in: copy the previous capture_canvas file instead of re-encoding when no bridge stroke or
+        # clear touched the canvas since. Changes made outside the bridge are not tracked.
+        self.reuse_unchanged_captures = reuse_unchanged_captures
 
         # Video capture settings
         self.enable_video_capture = enable_video_capture
         self.capture_fps = capture_fps
+        # Use lower FPS for video playback to make it longer
+        # We capture at 30 fps but play back at 10 fps = 3x longer video
+        self.playback_fps = 10
         self.capturing = False
         self.frame_counter = 0
-        self.temp_dir = "temp_frames"
         self.video_writer = None
         self.capture_thread = None
+        # Browser captures are handed to a separate encoder thread through a bounded queue
+        self.encoder_thread = None
+        self._frame_queue = queue.Queue(maxsize=8)
+        # Last decoded canvas frame (without overlay), reused while the canvas is unchanged
+        self._last_canvas_frame = None
 
         # Current step info for overlays
         self.current_step_number = 0
         self.current_step_text = ""
         self.session_start_time = None
+        # Overlay strip as (premultiplied RGB, 1 - alpha) arrays and the (step, text, width) it was rendered for
+        self._overlay_cache = None
+        self._overlay_key = None
+        # Reusable strip image and float blend buffer for the overlay
+        self._overlay_image = None
+        self._overlay_scratch = None
+
+        # Last brush selection and per-brush picker colors applied to the page, so repeats are skipped
+        self._last_brush_state = (None, None)
+        self._brush_colors = {}
+        # File written by the last capture_canvas call, copied while the canvas is unchanged
+        self._last_capture_path = None
 
     def start_canvas_interface(self):
         """Initialize the web driver and load the drawing canvas interface"""
@@ -61,6 +154,10 @@ class DrawingCanvasBridge:
 
         self.driver = webdriver.Chrome(options=options)
         self.driver.get(self.canvas_url)
+        # A fresh page starts with its default brush and colors
+        self._last_brush_state = (None, None)
+        self._brush_colors = {}
+        self._last_capture_path = None
 
         # Wait for the canvas to be ready
         self.wait = WebDriverWait(self.driver, 10)
@@ -83,15 +180,6 @@ class DrawingCanvasBridge:
         """Initialize video capture system"""
         self.session_start_time = datetime.now()
 
-        # Create temp directory for frames
-        if not os.path.exists(self.temp_dir):
-            os.makedirs(self.temp_dir)
-        else:
-            # Clean existing frames
-            for file in os.listdir(self.temp_dir):
-                if file.endswith('.png'):
-                    os.remove(os.path.join(self.temp_dir, file))
-
         print(f"🎥 Video capture initialized at {self.capture_fps} fps")
 
     def start_video_capture(self, output_path: str = None):
@@ -106,23 +194,21 @@ class DrawingCanvasBridge:
         # Ensure output directory exists
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
 
-        # Ensure temp directory exists and is clean
-        if not os.path.exists(self.temp_dir):
-            os.makedirs(self.temp_dir)
-        else:
-            # Clean existing frames from previous sessions
-            for file in os.listdir(self.temp_dir):
-                if file.endswith('.png'):
-                    try:
-                        os.remove(os.path.join(self.temp_dir, file))
-                    except Exception as e:
-                        print(f"Warning: Could not remove old frame {file}: {e}")
-
         self.video_output_path = output_path
-        self.capturing = True
         self.frame_counter = 0
 
-        # Start capture thread
+        # Frames are streamed straight into the encoder instead of temp image files
+        self.video_writer = imageio.get_writer(output_path, fps=self.playback_fps,
+                                               codec='libx264', quality=8)
+        self.capturing = True
+
+        # Start encoder and capture threads
+        self._frame_queue = queue.Queue(maxsize=8)
+        self._last_canvas_frame = None
+        # Force a full capture of the current canvas on the first tick
+        self.driver.execute_script("window.__canvasDirty = true;")
+        self.encoder_thread = threading.Thread(target=self._encode_loop, daemon=True)
+        self.encoder_thread.start()
         self.capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
         self.capture_thread.start()
 
@@ -135,20 +221,23 @@ class DrawingCanvasBridge:
 
         self.capturing = False
 
-        # Wait for capture thread to finish
+        # Wait for capture thread to finish, then let the encoder drain the queue
         if self.capture_thread:
             self.capture_thread.join(timeout=2.0)
-
-        # Compile video from frames
+            if self.capture_thread.is_alive():
+                # A stuck browser read never reaches the sentinel, so end the encoder's input here
+                self._frame_queue.put(None)
+        if self.encoder_thread:
+            # No timeout: the writer must not be closed while the encoder may still be appending frames
+            self.encoder_thread.join()
+
+        # Finalize the video stream
         self._compile_video()
 
-        # Cleanup temp frames
-        self._cleanup_temp_frames()
-
         print(f"🎉 Video capture completed: {self.video_output_path}")
 
     def _capture_loop(self):
-        """Continuous frame capture loop"""
+        """Continuous frame capture loop (browser reads only; encoding happens on the encoder thread)"""
         capture_interval = 1.0 / self.capture_fps
 
         while self.capturing:
@@ -158,61 +247,74 @@ class DrawingCanvasBridge:
             except Exception as e:
                 print(f"Frame capture error: {e}")
 
+        # Tell the encoder thread there are no more frames
+        self._frame_queue.put(None)
+
     def _capture_frame(self):
-        """Capture a single frame with text overlay"""
+        """Grab a single frame from the browser and queue it for encoding"""
         if not self.capturing or not self.driver:
             return
 
-        try:
-            # Use JavaScript to capture canvas
-            js_code = """
-            const canvas = document.querySelector('#p5-canvas canvas');
-            return canvas.toDataURL('image/png');
-            """
+        # Let the browser hand back a JPEG: much cheaper to encode/decode than PNG.
+        # Strokes and clears mark the canvas dirty; an unchanged canvas returns null
+        # and the encoder repeats the previous frame instead.
+        js_code = """
+        if (window.__canvasDirty === false) { return null; }
+        window.__canvasDirty = false;
+        const canvas = document.querySelector('#p5-canvas canvas');
+        return canvas.toDataURL('image/jpeg', 0.85);
+        """
 
-            data_url = self.driver.execute_script(js_code)
+        data_url = self.driver.execute_script(js_code)
 
-            # Remove the data URL prefix
-            image_data = data_url.split(',')[1]
+        # Snapshot the step info so the overlay matches the moment of capture.
+        # put() blocks while the encoder is behind instead of dropping frames.
+        self._frame_queue.put((data_url, self.current_step_number, self.current_step_text))
 
-            # Decode the image
-            image_bytes = base64.b64decode(image_data)
+    def _encode_loop(self):
+        """Decode queued frames, add the overlay and append them to the video"""
+        while True:
+            item = self._frame_queue.get()
+            if item is None:
+                break
+            self._encode_frame(*item)
 
-            # Convert to PIL Image
-            image = Image.open(io.BytesIO(image_bytes)).convert('RGB')
+    def _encode_frame(self, data_url: str, step_number: int, step_text: str):
+        """Decode a captured data URL and append it to the video stream"""
+        try:
+            if data_url is None:
+                # Canvas unchanged since the last capture: reuse the previous decoded frame
+                if self._last_canvas_frame is None:
+                    return
+                frame = self._last_canvas_frame.copy()
+            else:
+                # Remove the data URL prefix
+                image_data = data_url.split(',')[1]
+
+                # Decode the image
+                image_bytes = base64.b64decode(image_data)
+
+                # Decode in memory into a writable RGB array
+                frame = np.array(Image.open(io.BytesIO(image_bytes)).convert('RGB'))
+                self._last_canvas_frame = frame.copy()
 
             # Add text overlay if step info is available
-            if self.current_step_number > 0:
-                image = self._add_text_overlay(image)
+            if step_number > 0:
+                self._add_text_overlay(frame, step_number, step_text)
 
-            # Save frame
-            frame_path = os.path.join(self.temp_dir, f"frame_{self.frame_counter:06d}.png")
-            
-            # Ensure temp directory still exists (in case it was accidentally deleted)
-            if not os.path.exists(self.temp_dir):
-                print(f"Warning: temp directory {self.temp_dir} doesn't exist, recreating...")
-                os.makedirs(self.temp_dir, exist_ok=True)
-            
-            image.save(frame_path)
+            # Append the frame to the video stream
+            self.video_writer.append_data(frame)
             self.frame_counter += 1
 
         except Exception as e:
-            print(f"Error capturing frame: {e}")
-            print(f"  Temp dir: {self.temp_dir}")
-            print(f"  Temp dir exists: {os.path.exists(self.temp_dir)}")
+            print(f"Error encoding frame: {e}")
             print(f"  Frame counter: {self.frame_counter}")
             print(f"  Capturing: {self.capturing}")
 
-    def _add_text_overlay(self, image: Image.Image) -> Image.Image:
-        """Add text overlay to frame"""
-        try:
-            # Create overlay
-            overlay = Image.new('RGBA', image.size, (0, 0, 0, 0))
-            draw = ImageDraw.Draw(overlay)
-
-            # Add semi-transparent background rectangle
-            draw.rectangle([(10, 10), (image.width - 10, 100)], fill=(0, 0, 0, 180))
-
+    @classmethod
+    def _get_fonts(cls):
+        """Load the overlay title/text fonts once and reuse them for every frame"""
+        if cls._fonts is None:
             # Try to use a better font, fall back to default if not available
             try:
                 title_font = ImageFont.truetype("arial.ttf", 28)
@@ -230,86 +332,95 @@ class DrawingCanvasBridge:
                         # Use default font
                         title_font = ImageFont.load_default()
                         text_font = ImageFont.load_default()
+            cls._fonts = (title_font, text_font)
+        return cls._fonts
+
+    def _render_overlay(self, width: int, step_number: int, step_text: str) -> Image.Image:
+        """Rasterize a step's overlay strip (top 101 rows of the frame)"""
+        # Reuse one strip image across steps, clearing it instead of allocating a new one
+        overlay = self._overlay_image
+        if overlay is None or overlay.width != width:
+            overlay = self._overlay_image = Image.new('RGBA', (width, self.OVERLAY_HEIGHT), (0, 0, 0, 0))
+        else:
+            overlay.paste((0, 0, 0, 0), (0, 0, width, self.OVERLAY_HEIGHT))
+        draw = ImageDraw.Draw(overlay)
+
+        # Add semi-transparent background rectangle
+        draw.rectangle([(10, 10), (width - 10, 100)], fill=(0, 0, 0, 180))
 
-            # Add step number
-            draw.text((20, 20), f"Step {self.current_step_number}", fill=(255, 255, 255, 255), font=title_font)
+        title_font, text_font = self._get_fonts()
 
-            # Add reasoning text (wrap if too long)
-            if self.current_step_text:
-                text_lines = self.current_step_text.split('. ')
-                y_offset = 50
-                for i, line in enumerate(text_lines[:2]):  # Max 2 lines
-                    if len(line) > 80:
-                        line = line[:77] + "..."
-                    draw.text((20, y_offset), line, fill=(255, 255, 255, 255), font=text_font)
-                    y_offset += 25
+        # Add step number
+        draw.text((20, 20), f"Step {step_number}", fill=(255, 255, 255, 255), font=title_font)
 
-            # Combine images
-            image = Image.alpha_composite(image.convert('RGBA'), overlay)
-            return image.convert('RGB')
+        # Add reasoning text (wrap if too long)
+        if step_text:
+            text_lines = step_text.split('. ')
+            y_offset = 50
+            for i, line in enumerate(text_lines[:2]):  # Max 2 lines
+                if len(line) > 80:
+                    line = line[:77] + "..."
+                draw.text((20, y_offset), line, fill=(255, 255, 255, 255), font=text_font)
+                y_offset += 25
+
+        return overlay
+
+    def _add_text_overlay(self, frame: np.ndarray, step_number: int = None, step_text: str = None) -> np.ndarray:
+        """Blend the step text overlay into the top strip of an RGB frame array, in place"""
+        if step_number is None:
+            step_number, step_text = self.current_step_number, self.current_step_text
+        try:
+            # The overlay only changes once per step, so rasterize it once and keep it as
+            # premultiplied color + inverse alpha, ready for a direct blend
+            width = frame.shape[1]
+            overlay_key = (step_number, step_text, width)
+            if self._overlay_cache is None or self._overlay_key != overlay_key:
+                overlay = np.asarray(self._render_overlay(width, step_number, step_text), dtype=np.float32)
+                alpha = overlay[..., 3:4] * (1.0 / 255)
+                self._overlay_cache = (overlay[..., :3] * alpha + 0.5, 1.0 - alpha)
+                self._overlay_key = overlay_key
+
+            # Only the overlay strip is touched, not the whole frame
+            premultiplied, inverse_alpha = self._overlay_cache
+            rows = min(frame.shape[0], premultiplied.shape[0])
+            strip = frame[:rows]
+            # Blend through a reusable float buffer rather than allocating temporaries per frame
+            scratch = self._overlay_scratch
+            if scratch is None or scratch.shape != strip.shape:
+                scratch = self._overlay_scratch = np.empty(strip.shape, dtype=np.float32)
+            np.multiply(strip, inverse_alpha[:rows], out=scratch)
+            np.add(scratch, premultiplied[:rows], out=scratch)
+            np.copyto(strip, scratch, casting='unsafe')
+            return frame
 
         except Exception as e:
             print(f"Error adding text overlay: {e}")
-            return image
+            return frame
 
     def _compile_video(self):
-        """Compile frames into MP4 video"""
+        """Close the streaming video writer and report the result"""
         try:
-            # Get all frame files
-            frame_files = sorted([f for f in os.listdir(self.temp_dir) if f.endswith('.png')])
-
-            if not frame_files:
-                print("No frames to compile into video")
+            if self.video_writer is None:
                 return
 
-            print(f"🎞️ Compiling {len(frame_files)} frames into video...")
-
-            # Use lower FPS for video playback to make it longer
-            # We capture at 30 fps but play back at 10 fps = 3x longer video
-            playback_fps = 10
-
-            # Create video writer with lower playback FPS
-            writer = imageio.get_writer(self.video_output_path, fps=playback_fps,
-                                     codec='libx264', quality=8)
-
             try:
-                for i, frame_file in enumerate(frame_files):
-                    frame_path = os.path.join(self.temp_dir, frame_file)
-                    frame = imageio.imread(frame_path)
-                    writer.append_data(frame)
-
-                    # Progress indicator
-                    if (i + 1) % 100 == 0:
-                        print(f"  Processed {i + 1}/{len(frame_files)} frames...")
-
+                self.video_writer.close()
             finally:
-                writer.close()
+                self.video_writer = None
+
+            if not self.frame_counter:
+                print("No frames were captured into the video")
+                return
 
             # Calculate video duration with playback FPS
-            video_duration = len(frame_files) / playback_fps
-            capture_duration = len(frame_files) / self.capture_fps
+            video_duration = self.frame_counter / self.playback_fps
+            capture_duration = self.frame_counter / self.capture_fps
             print(f"📹 Video duration: {video_duration:.1f} seconds (captured in {capture_duration:.1f}s real-time)")
-            print(f"🎬 Playback: {playback_fps} fps (captured at {self.capture_fps} fps)")
+            print(f"🎬 Playback: {self.playback_fps} fps (captured at {self.capture_fps} fps)")
 
         except Exception as e:
             print(f"Error compiling video: {e}")
 
-    def _cleanup_temp_frames(self):
-        """Clean up temporary frame files but keep the directory"""
-        try:
-            if os.path.exists(self.temp_dir):
-                for file in os.listdir(self.temp_dir):
-                    file_path = os.path.join(self.temp_dir, file)
-                    if os.path.isfile(file_path):
-                        try:
-                            os.remove(file_path)
-                        except Exception as file_error:
-                            print(f"Warning: Could not remove frame file {file_path}: {file_error}")
-                # Don't remove the directory itself - keep it for next session
-                print(f"🗑️ Cleaned up temp frames from {self.temp_dir}")
-        except Exception as e:
-            print(f"Warning: Failed to cleanup temp files: {e}")
-
     def set_current_step_info(self, step_number: int, step_text: str):
         """Set current step information for video overlays"""
         self.current_step_number = step_number
@@ -317,6 +428,8 @@ class DrawingCanvasBridge:
 
     def set_brush(self, brush_type: str, color: str = "default"):
         """Set the brush type and color in the interface using the brush buttons and color pickers"""
+        if (brush_type, color) == self._last_brush_state:
+            return
         print(f"Setting brush: {brush_type} with color: {color}")
         try:
             # Map brush types to button classes in drawing_canvas.html
@@ -334,19 +447,29 @@ class DrawingCanvasBridge:
                 print(f"Available brush types: {list(brush_button_map.keys())}")
                 brush_type = "pen"  # Use default
 
-            # Click the appropriate brush button
+            # Click the appropriate brush button in a single round trip
             brush_class = brush_button_map[brush_type]
-            brush_button = self.driver.find_element(By.CSS_SELECTOR, f".brush-btn.{brush_class}")
-            brush_button.click()
+            self.driver.execute_script(
+                "const btn = document.querySelector(arguments[0]);"
+                "if (!btn) { throw new Error('brush button not found: ' + arguments[0]); }"
+                "btn.click();",
+                f".brush-btn.{brush_class}"
+            )
 
             time.sleep(0.5)  # Wait for brush to be set
 
             # Set color for customizable brushes
             color_customizable_brushes = ["marker", "crayon", "wiggle"]
+            color_applied = True
             if brush_type in color_customizable_brushes and color != "default":
                 self.set_brush_color(brush_type, color)
+                color_applied = self._brush_colors.get(brush_type) == color
+
+            # Only remember the selection once it fully took effect
+            self._last_brush_state = (brush_type, color) if color_applied else (None, None)
 
         except Exception as e:
+            self._last_brush_state = (None, None)
             print(f"Error setting brush '{brush_type}': {e}")
             # Try to set default pen brush
             try:
@@ -370,20 +493,28 @@ class DrawingCanvasBridge:
                 print(f"Warning: Brush '{brush_type}' does not support color customization")
                 return
 
-            # Find the color picker element
-            color_picker_id = color_picker_map[brush_type]
-            color_picker = self.driver.find_element(By.ID, color_picker_id)
-
-            # Set the color value using JavaScript
-            self.driver.execute_script(f"document.getElementById('{color_picker_id}').value = '{color}';")
+            if self._brush_colors.get(brush_type) == color:
+                return
 
-            # Trigger the change event to update the brush color
-            self.driver.execute_script(f"document.getElementById('{color_picker_id}').dispatchEvent(new Event('change'));")
+            # The picker is about to change, so the remembered set_brush selection no longer holds
+            self._last_brush_state = (None, None)
+            # Set the color value and trigger the change event in a single round trip
+            color_picker_id = color_picker_map[brush_type]
+            self.driver.execute_script(
+                "const picker = document.getElementById(arguments[0]);"
+                "if (!picker) { throw new Error('color picker not found: ' + arguments[0]); }"
+                "picker.value = arguments[1];"
+                "picker.dispatchEvent(new Event('change'));",
+                color_picker_id, color
+            )
 
             print(f"Set {brush_type} color to {color}")
             time.sleep(0.2)  # Small delay for color to be applied
+            self._brush_colors[brush_type] = color
 
         except Exception as e:
+            self._brush_colors.pop(brush_type, None)
+            self._last_brush_state = (None, None)
             print(f"Error setting color for brush '{brush_type}': {e}")
 
     def execute_stroke(self, stroke: dict,brush_type: str = "pen"):
@@ -393,9 +524,10 @@ class DrawingCanvasBridge:
             return
 
         # Handle multi-point stroke
-        best_params = {"fountain": [28,70], "marker": [8,20], "spray": [20,50], "wiggle": [8,20], "crayon": [8,20]}
-        step_length = best_params[brush_type][0]
-        step_duration = best_params[brush_type][1]
+        step_length, step_duration = self.BRUSH_STROKE_PARAMS[brush_type]
+        # With fast playback enabled, skip the step delay when there is no recording to animate
+        if self.fast_playback and not self.capturing:
+            step_duration = 0
         if "x" in stroke and "y" in stroke:
             x_coords = stroke["x"]
             y_coords = stroke["y"]
@@ -406,66 +538,40 @@ class DrawingCanvasBridge:
     def _execute_continuous_stroke(self, x_coords: list, y_coords: list, step_length: int = 20, step_duration: int = 50,brush_type: str = "fountain"):
         """Execute a continuous stroke using JavaScript mouse events with smooth interpolation"""
         print(f"Executing continuous stroke with step_length: {step_length} and step_duration: {step_duration}")
+        xs = np.asarray(x_coords, dtype=np.float64)
+        ys = np.asarray(y_coords, dtype=np.float64)
+        # Draw only the points that have both coordinates
+        if len(xs) != len(ys):
+            n = min(len(xs), len(ys))
+            xs, ys = xs[:n], ys[:n]
+            x_coords, y_coords = list(x_coords[:n]), list(y_coords[:n])
+        dx = np.diff(xs)
+        dy = np.diff(ys)
+        # Drop consecutive repeated points: they draw nothing but still cost a playback delay each
+        moved = (dx != 0) | (dy != 0)
+        if not moved.all():
+            keep = np.concatenate(([True], moved))
+            xs, ys = xs[keep], ys[keep]
+            x_coords, y_coords = xs.tolist(), ys.tolist()
+            dx, dy = dx[moved], dy[moved]
         # Calculate total time for stroke execution
-        total_time = 0
-        for i in range(len(x_coords)-1):
-            # Calculate distance between points
-            distance = ((x_coords[i+1] - x_coords[i])**2 + (y_coords[i+1] - y_coords[i])**2)**0.5
-            # Calculate steps needed for this segment
-            steps_per_segment = max(1, int(distance / step_length))
-            # Add time for each step in segment
-            total_time += steps_per_segment * step_duration
+        # Steps needed per segment, matching the JS playback's Math.max(1, Math.floor(distance / step_length))
+        steps_per_segment = np.maximum(1, np.floor(np.sqrt(dx * dx + dy * dy) / step_length))
+        total_time = int(steps_per_segment.sum()) * step_duration
         print(f"Total stroke execution time: {total_time/1000:.2f} seconds")
-        js_code = f'''
-        const x_coords = {x_coords};
-        const y_coords = {y_coords};
-        const fixed_step_length = {step_length};
-        const step_delay = {step_duration}; // delay between each point
-
-        function lerp(a, b, t) {{ return a + (b - a) * t; }}
-
-        async function drawStroke() {{
-            for (let i = 0; i < x_coords.length - 1; i++) {{
-                const startX = x_coords[i];
-                const startY = y_coords[i];
-                const endX = x_coords[i+1];
-                const endY = y_coords[i+1];
-
-                // Calculate distance between this pair of points
-                const distance = Math.sqrt(Math.pow(endX - startX, 2) + Math.pow(endY - startY, 2));
-
-                // Calculate steps needed for this specific stroke
-                const steps_per_segment = Math.max(1, Math.floor(distance / fixed_step_length));
-
-                for (let s = 0; s <= steps_per_segment; s++) {{
-                    const t = s / steps_per_segment;
-                    const interpX = lerp(startX, endX, t);
-                    const interpY = lerp(startY, endY, t);
-                    window.pmouseX = (s === 0) ? startX : window.mouseX;
-                    window.pmouseY = (s === 0) ? startY : window.mouseY;
-                    window.mouseX = interpX;
-                    window.mouseY = interpY;
-
-                    // Only call brush_type if there is movement
-                    if ((window.mouseX !== window.pmouseX) || (window.mouseY !== window.pmouseY)) {{
-                        if (typeof window['{brush_type}'] === 'function') {{
-                            window['{brush_type}']();
-                        }}
-                    }}
-
-                    // Add delay between each point for smooth drawing
-                    if (step_delay > 0 && s < steps_per_segment) {{
-                        await new Promise(resolve => setTimeout(resolve, step_delay));
-                    }}
-                }}
-            }}
-        }}
-
-        drawStroke();
-        '''
-        self.driver.execute_script(js_code)
-        #wait for the stroke to finish
-        time.sleep(total_time/1000 + 0.5)
+        # Coordinates and parameters are marshalled as script arguments rather than formatted into the source
+        self.driver.execute_script(self._STROKE_JS, x_coords, y_coords, step_length, step_duration, brush_type)
+        # Without a step delay the playback runs synchronously inside execute_script
+        if step_duration <= 0:
+            return
+        # Wait for the stroke to report completion instead of sleeping for a fixed upper bound;
+        # polling (rather than an async script) keeps the driver free for video frame capture
+        try:
+            WebDriverWait(self.driver, total_time/1000 + 5, poll_frequency=0.05).until(
+                lambda driver: driver.execute_script("return window.__strokeDone === true;")
+            )
+        except TimeoutException:
+            print("Warning: stroke did not report completion in time")
 
 
     def execute_instruction(self, instruction: DrawingInstruction, step_number: int = 0):
@@ -480,30 +586,51 @@ class DrawingCanvasBridge:
         # Set the brush and color
         self.set_brush(instruction.brush, instruction.color)
 
+        # With fast playback and no recording there is nothing to animate, so draw every stroke in one round trip
+        if self.fast_playback and not self.capturing and self.canvas:
+            self._execute_strokes_batch(instruction.strokes, instruction.brush)
+            return
+
         # Execute all strokes
         for i, stroke in enumerate(instruction.strokes):
             print(f"  Drawing stroke {i+1}/{len(instruction.strokes)}")
             self.execute_stroke(stroke,instruction.brush)
 
+    def _execute_strokes_batch(self, strokes: list, brush_type: str):
+        """Draw all strokes of an instruction synchronously with a single execute_script call"""
+        step_length, _ = self.BRUSH_STROKE_PARAMS[brush_type]
+        batch = [[stroke["x"], stroke["y"]] for stroke in strokes if "x" in stroke and "y" in stroke]
+        print(f"  Drawing {len(batch)} strokes in one batch with step_length: {step_length}")
+        self.driver.execute_script(self._STROKE_BATCH_JS, batch, step_length, brush_type)
+
     def capture_canvas(self, filename: str = "current_canvas.png"):
         """Capture the current canvas as an image"""
         try:
             # Use p5.js save function to capture the canvas
             js_code = """
-            // Get the p5 canvas and convert to data URL
+            // Skip the PNG encode when nothing was drawn since the last capture
+            if (!arguments[0] && window.__captureDirty === false) { return null; }
+            window.__captureDirty = false;
+            // Get the p5 canvas as PNG and return only the base64 payload, without the data URL prefix
             const canvas = document.querySelector('#p5-canvas canvas');
-            return canvas.toDataURL('image/png');
+            const url = canvas.toDataURL('image/png');
+            return url.substring(url.indexOf(',') + 1);
             """
 
-            data_url = self.driver.execute_script(js_code)
+            last_path = self._last_capture_path
+            force = not self.reuse_unchanged_captures or last_path is None or not os.path.isfile(last_path)
+            self._last_capture_path = None
+            image_data = self.driver.execute_script(js_code, force)
 
-            # Remove the data URL prefix
-            image_data = data_url.split(',')[1]
-
-            # Decode and save the image
-            image_bytes = base64.b64decode(image_data)
-            with open(filename, 'wb') as f:
-                f.write(image_bytes)
+            if image_data is None:
+                # Canvas unchanged: reuse the previous capture instead of re-encoding it
+                if os.path.abspath(filename) != os.path.abspath(last_path):
+                    shutil.copyfile(last_path, filename)
+            else:
+                # Decode and save the image in a single binary write
+                with open(filename, 'wb') as f:
+                    f.write(base64.b64decode(image_data, validate=True))
+            self._last_capture_path = filename
 
             print(f"Canvas captured and saved as '{filename}'")
             return filename
@@ -515,8 +642,14 @@ class DrawingCanvasBridge:
     def clear_canvas(self):
         """Clear the canvas using the clear button"""
         try:
-            clear_button = self.driver.find_element(By.CSS_SELECTOR, ".clear-btn")
-            clear_button.click()
+            # Click the clear button and mark the canvas changed in a single round trip
+            self.driver.execute_script(
+                "const btn = document.querySelector('.clear-btn');"
+                "if (!btn) { throw new Error('clear button not found'); }"
+                "btn.click();"
+                "window.__canvasDirty = true;"
+                "window.__captureDirty = true;"
+            )
             time.sleep(0.5)
             print("Canvas cleared")
         except Exception as e:
@@ -548,7 +681,8 @@ class AutomatedDrawingCanvas:
         self.bridge.start_canvas_interface()
 
     def draw_from_canvas(self, canvas_filename: str = "current_canvas.png",
-                        question: str = "What would you like to draw next?", step_number: int = 0):
+                        question: str = "What would you like to draw next?", step_number: int = 0,
+                        capture: bool = True):
         """
         Analyze the current canvas and execute a drawing instruction.
 
@@ -556,12 +690,14 @@ class AutomatedDrawingCanvas:
             canvas_filename: Filename to save/load the current canvas
             question: Question to ask the agent about what to draw
             step_number: Step number for video overlays
+            capture: Capture the canvas first; pass False if canvas_filename already holds the current canvas
 
         Returns:
             The executed DrawingInstruction
         """
         # Capture current canvas state
-        self.bridge.capture_canvas(canvas_filename)
+        if capture:
+            self.bridge.capture_canvas(canvas_filename)
 
         # Get drawing instruction from agent
         instruction = self.agent.create_drawing_instruction(canvas_filename, question)
@@ -624,13 +760,15 @@ class AutomatedDrawingCanvas:
 
         return instruction
 
-    def creative_session(self, num_iterations: int = 5, output_dir: str = 'output'):
+    def creative_session(self, num_iterations: int = 5, output_dir: str = 'output', keep_all_steps: bool = True):
         """
         Run a creative drawing session with multiple iterations.
 
         Args:
             num_iterations: Number of drawing iterations to perform
             output_dir: Directory to save outputs
+            keep_all_steps: Keep every canvas_step_N.png; if False, each step image is
+                deleted once the next one is written, leaving only the latest and the final artwork
         """
         print(f"🎨 Starting creative drawing session with {num_iterations} iterations")
 
@@ -646,7 +784,7 @@ class AutomatedDrawingCanvas:
             self.bridge.start_video_capture(video_output)
 
         # Capture initial blank canvas
-        self.bridge.capture_canvas(f"{output_dir}/canvas_step_0.png")
+        captured = self.bridge.capture_canvas(f"{output_dir}/canvas_step_0.png") is not None
 
         instructions = []
 
@@ -667,11 +805,16 @@ class AutomatedDrawingCanvas:
 
                 # question = questions[i % len(questions)]
                 question = "What would you like to draw next?"
-                instruction = self.draw_from_canvas(canvas_file, question, step_number=i+1)
+                # canvas_step_{i}.png was captured at the end of the previous iteration (or before the loop);
+                # if that capture failed, capture again rather than sending a missing or stale file
+                instruction = self.draw_from_canvas(canvas_file, question, step_number=i+1, capture=not captured)
                 instructions.append(instruction)
 
                 # Capture the result
-                self.bridge.capture_canvas(f"{output_dir}/canvas_step_{i+1}.png")
+                captured = self.bridge.capture_canvas(f"{output_dir}/canvas_step_{i+1}.png") is not None
+                if captured and not keep_all_steps and os.path.exists(canvas_file):
+                    # Only the latest step image is read by the next iteration
+                    os.remove(canvas_file)
 
                 print(f"Agent's thinking: {instruction.thinking}")
 
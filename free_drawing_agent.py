@@ -7,22 +7,180 @@ outputting JSON instructions compatible with the drawing_canvas.html interface.
 from __future__ import annotations
 import json
 import base64
-import anthropic
+import atexit
+import functools
 from typing import Dict, List, Optional,Tuple
 from dataclasses import dataclass
 import time
 import os
 from dotenv import load_dotenv
+import io
 import random
+import re
+from collections import deque
 from datetime import datetime
-from PIL import Image
-import numpy as np
+# anthropic, openai, PIL and numpy are imported where they are used to keep startup fast
 # import google.generativeai as genai
-import openai
+
+# Optional: orjson is a faster drop-in for parsing the LLM's JSON replies
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Image media types accepted by the vision APIs, keyed by lower-cased file extension
+_MEDIA_TYPE_MAP = {
+    '.png': 'image/png',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.gif': 'image/gif',
+    '.webp': 'image/webp'
+}
+
+# JSON inside a markdown code fence, and the widest {...} span in a response
+_JSON_FENCE_RE = re.compile(r'```(?:json)?\s*(\{.*?\})\s*```', re.DOTALL)
+_JSON_SPAN_RE = re.compile(r'\{.*\}', re.DOTALL)
+# JSON cleanup patterns: quoted strings (with escapes), trailing commas, and json error positions
+_JSON_STRING_RE = re.compile(r'"(?:[^"\\]|\\[\\"/bfnrt]|\\u[0-9a-fA-F]{4})*"')
+_TRAILING_COMMA_RE = re.compile(r',(\s*[}\]])')
+_ERROR_POS_RE = re.compile(r'char (\d+)')
+
+def _json_loads(text: str):
+    """Parse JSON with orjson when available, falling back to the stdlib.
+
+    orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can
+    keep catching the stdlib exception.
+    """
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+# Canvas captures are lossless PNGs; encode_image re-encodes these as JPEG for the API payload
+_TRANSCODED_EXTENSIONS = {'.png'}
+
+def _json_dumps(obj) -> str:
+    """Serialize to a compact single-line JSON string, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj).decode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+
+def _is_transcoded(ext: str) -> bool:
+    """Whether encode_image re-encodes files with this lower-cased extension as JPEG"""
+    # Formats without a known media type are transcoded too, so the payload always matches its label
+    return ext in _TRANSCODED_EXTENSIONS or ext not in _MEDIA_TYPE_MAP
+
+@functools.lru_cache(maxsize=32)
+def _media_type_for_extension(ext: str) -> str:
+    """Look up the media type of the encoded payload for a lower-cased file extension"""
+    if _is_transcoded(ext):
+        return 'image/jpeg'
+    return _MEDIA_TYPE_MAP[ext]
+
+# Strokes shorter than this are clamped in plain Python; NumPy's call overhead only pays off on longer ones
+_VECTOR_CLAMP_MIN_POINTS = 8
+
+def _clamp_coords(coords: list, upper: float, as_float: bool = False) -> list:
+    """
+    Clamp stroke coordinates to [0, upper].
+
+    With as_float every result is a float, and long strokes are clamped with NumPy.
+    Otherwise each coordinate keeps its own type, so mixed int/float strokes stay mixed.
+    """
+    # Plain Python path: bind the builtins locally so the comprehension skips global lookups
+    _max, _min = max, min
+    if not as_float:
+        return [_max(0, _min(upper, c)) for c in coords]
+    if len(coords) >= _VECTOR_CLAMP_MIN_POINTS:
+        try:
+            import numpy as np
+        except ImportError:
+            np = None
+        if np is not None:
+            # float() each value, as the Python path does, so null/non-numeric coordinates raise instead of becoming NaN
+            values = np.fromiter((float(c) for c in coords), dtype=np.float64, count=len(coords))
+            return np.clip(values, 0, upper).tolist()
+    lower, upper = 0.0, float(upper)
+    return [_max(lower, _min(upper, float(c))) for c in coords]
+
+# Curated color palette shared by all agents (family -> shade -> hex)
+_COLOR_PALETTE = {
+    'keppel': {
+        'DEFAULT': '#6BB9A4',
+        '100': '#132822',
+        '200': '#254F44',
+        '300': '#387766',
+        '400': '#4A9E88',
+        '500': '#6BB9A4',
+        '600': '#88C7B6',
+        '700': '#A6D5C8',
+        '800': '#C3E3DB',
+        '900': '#E1F1ED'
+    },
+    'sky_blue': {
+        'DEFAULT': '#7FC9E1',
+        '100': '#0D2E39',
+        '200': '#1B5C72',
+        '300': '#288AAB',
+        '400': '#46B0D4',
+        '500': '#7FC9E1',
+        '600': '#99D3E7',
+        '700': '#B2DEED',
+        '800': '#CCE9F3',
+        '900': '#E5F4F9'
+    },
+    'tea_rose_(red)': {
+        'DEFAULT': '#FFD1D1',
+        '100': '#5D0000',
+        '200': '#BA0000',
+        '300': '#FF1717',
+        '400': '#FF7474',
+        '500': '#FFD1D1',
+        '600': '#FFDADA',
+        '700': '#FFE3E3',
+        '800': '#FFEDED',
+        '900': '#FFF6F6'
+    },
+    'light_red': {
+        'DEFAULT': '#FF7878',
+        '100': '#4B0000',
+        '200': '#970000',
+        '300': '#E20000',
+        '400': '#FF2F2F',
+        '500': '#FF7878',
+        '600': '#FF9595',
+        '700': '#FFAFAF',
+        '800': '#FFCACA',
+        '900': '#FFE4E4'
+    },
+    'jasmine': {
+        'DEFAULT': '#FFE978',
+        '100': '#4B3F00',
+        '200': '#977E00',
+        '300': '#E2BD00',
+        '400': '#FFDC2F',
+        '500': '#FFE978',
+        '600': '#FFED95',
+        '700': '#FFF2AF',
+        '800': '#FFF6CA',
+        '900': '#FFFBE4'
+    },
+    'wisteria': {
+        'DEFAULT': '#CF94EE',
+        '100': '#2F0A43',
+        '200': '#5E1586',
+        '300': '#8E1FC9',
+        '400': '#B152E4',
+        '500': '#CF94EE',
+        '600': '#D9AAF2',
+        '700': '#E2BFF5',
+        '800': '#ECD5F8',
+        '900': '#F5EAFC'
+    }
+}
+
 @dataclass
 class DrawingInstruction:
     """Represents a drawing instruction to be executed on drawing_canvas.html"""
@@ -37,28 +195,34 @@ class FreeDrawingAgent:
     and generates creative drawing instructions for drawing_canvas.html
     """
 
+    # Default (x, y) stroke points used when the model's response cannot be used
+    _FALLBACK_STROKE = ((400, 450), (250, 275))
+    _ABSTRACT_FALLBACK_STROKE = ((400, 450, 500), (250, 200, 275))
+
     def __init__(self, api_key: str, enable_logging: bool = True,model_type: str = "claude",verbose: bool = False):
         self.api_key = api_key
         self.model_type = model_type
         self.verbose = verbose
         if model_type == "claude":
+            import anthropic
             self.client = anthropic.Anthropic(api_key=api_key)
             self.model = "claude-3-5-sonnet-20241022"
         elif model_type == "gemini":
             self.client = google.generativeai.Client(api_key=api_key)
             self.model = "gemini-2.5-flash"
         elif model_type == "openai":
+            import openai
             self.client = openai.OpenAI(api_key=api_key)
             openai.api_key = api_key
             self.model = "gpt-4o"
         self.enable_logging = enable_logging
         # Brush tracking for variety
-        self.recent_brushes = []
         self.max_brush_history = 5
+        self.recent_brushes = deque(maxlen=self.max_brush_history)
 
         # Stroke history tracking for spatial reasoning
-        self.stroke_history = []
         self.max_stroke_history = 10  # Keep last 10 strokes for context
+        self.stroke_history = deque(maxlen=self.max_stroke_history)
 
         # Create logging directory if it doesn't exist
         if self.enable_logging:
@@ -67,20 +231,11 @@ class FreeDrawingAgent:
             # Create session-level log files with timestamp
             session_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             self.session_log_file = f"output/log/session_responses_{session_timestamp}.txt"
-            self.session_summary_file = f"output/log/session_summary_{session_timestamp}.txt"
-
-            # Initialize log files with headers
-            with open(self.session_log_file, 'w', encoding='utf-8') as f:
-                f.write(f"=== Drawing Agent Session Log ===\n")
-                f.write(f"Started: {datetime.now().isoformat()}\n")
-                f.write(f"Model: {self.model}\n")
-                f.write(f"{'='*50}\n\n")
+            self.session_summary_file = f"output/log/session_summary_{session_timestamp}.jsonl"
 
-            with open(self.session_summary_file, 'w', encoding='utf-8') as f:
-                f.write(f"=== Drawing Agent Session Summary ===\n")
-                f.write(f"Started: {datetime.now().isoformat()}\n")
-                f.write(f"Model: {self.model}\n")
-                f.write(f"{'='*50}\n\n")
+            # Keep both log files open for the whole session; entries are
+            # buffered and flushed on close instead of reopening every step
+            self._start_session_logs(mode='w')
 
             print(f"📝 Session logs initialized:")
             print(f"   Full responses: {self.session_log_file}")
@@ -88,108 +243,89 @@ class FreeDrawingAgent:
         else:
             self.session_log_file = None
             self.session_summary_file = None
+            self._log_fh = None
+            self._summary_fh = None
 
-        # Initialize color palette
-        self.color_palette = {
-            'keppel': {
-                'DEFAULT': '#6BB9A4',
-                '100': '#132822',
-                '200': '#254F44',
-                '300': '#387766',
-                '400': '#4A9E88',
-                '500': '#6BB9A4',
-                '600': '#88C7B6',
-                '700': '#A6D5C8',
-                '800': '#C3E3DB',
-                '900': '#E1F1ED'
-            },
-            'sky_blue': {
-                'DEFAULT': '#7FC9E1',
-                '100': '#0D2E39',
-                '200': '#1B5C72',
-                '300': '#288AAB',
-                '400': '#46B0D4',
-                '500': '#7FC9E1',
-                '600': '#99D3E7',
-                '700': '#B2DEED',
-                '800': '#CCE9F3',
-                '900': '#E5F4F9'
-            },
-            'tea_rose_(red)': {
-                'DEFAULT': '#FFD1D1',
-                '100': '#5D0000',
-                '200': '#BA0000',
-                '300': '#FF1717',
-                '400': '#FF7474',
-                '500': '#FFD1D1',
-                '600': '#FFDADA',
-                '700': '#FFE3E3',
-                '800': '#FFEDED',
-                '900': '#FFF6F6'
-            },
-            'light_red': {
-                'DEFAULT': '#FF7878',
-                '100': '#4B0000',
-                '200': '#970000',
-                '300': '#E20000',
-                '400': '#FF2F2F',
-                '500': '#FF7878',
-                '600': '#FF9595',
-                '700': '#FFAFAF',
-                '800': '#FFCACA',
-                '900': '#FFE4E4'
-            },
-            'jasmine': {
-                'DEFAULT': '#FFE978',
-                '100': '#4B3F00',
-                '200': '#977E00',
-                '300': '#E2BD00',
-                '400': '#FFDC2F',
-                '500': '#FFE978',
-                '600': '#FFED95',
-                '700': '#FFF2AF',
-                '800': '#FFF6CA',
-                '900': '#FFFBE4'
-            },
-            'wisteria': {
-                'DEFAULT': '#CF94EE',
-                '100': '#2F0A43',
-                '200': '#5E1586',
-                '300': '#8E1FC9',
-                '400': '#B152E4',
-                '500': '#CF94EE',
-                '600': '#D9AAF2',
-                '700': '#E2BFF5',
-                '800': '#ECD5F8',
-                '900': '#F5EAFC'
-            }
-        }
+        # Shared module-level color palette
+        self.color_palette = _COLOR_PALETTE
+
+        # Base64 payloads keyed by (path, mtime_ns, size) so an unchanged canvas is encoded once
+        self._img_cache: Dict[Tuple, str] = {}
+        self.max_img_cache = 4
 
     def encode_image(self, image_path: str) -> str:
         """Encode image to base64 for API transmission"""
-        #compress the image to 1/100 of its original size
-        img = Image.open(image_path)
-        img = img.resize((img.width // 10, img.height // 10))
-        #save the compressed image
-        img.save("output/compressed_image.png")
-        with open(image_path, "rb") as image_file:
-            return base64.b64encode(image_file.read()).decode('utf-8')
-        #delete the compressed image
-        os.remove(image_path)
+        st = os.stat(image_path)
+        key = (image_path, st.st_mtime_ns, st.st_size)
+        cached = self._img_cache.get(key)
+        if cached is not None:
+            return cached
 
-    def _get_image_media_type(self, image_path: str) -> str:
-        """Determine the correct media type based on file extension"""
-        _, ext = os.path.splitext(image_path.lower())
-
-        media_type_map = {
-            '.png': 'image/png',
-            '.jpg': 'image/jpeg',
-            '.jpeg': 'image/jpeg',
-            '.gif': 'image/gif',
-            '.webp': 'image/webp'
-        }
+        if _is_transcoded(os.path.splitext(image_path)[1].lower()):
+            from PIL import Image
+
+            # JPEG is far cheaper to encode than PNG and 2-3x smaller on the wire
+            img = Image.open(image_path)
+            if img.mode != 'RGB':
+                # Flatten transparency onto white rather than letting convert() turn it black
+                background = Image.new('RGB', img.size, (255, 255, 255))
+                rgba = img.convert('RGBA')
+                background.paste(rgba, mask=rgba.getchannel('A'))
+                img = background
+            buffer = io.BytesIO()
+            img.save(buffer, 'JPEG', quality=85, optimize=False, subsampling=2)
+            image_bytes = buffer.getvalue()
+        else:
+            with open(image_path, "rb") as image_file:
+                image_bytes = image_file.read()
+        encoded = base64.b64encode(image_bytes).decode('utf-8')
+
+        # Evict the oldest entry once the cache is full
+        if len(self._img_cache) >= self.max_img_cache:
+            self._img_cache.pop(next(iter(self._img_cache)))
+        self._img_cache[key] = encoded
+        return encoded
 
-        return media_type_map.get(ext, 'image/png')
+    def _get_image_media_type(self, image_path: str) -> str:
+        """Determine the media type of encode_image's payload based on file extension"""
+        return _media_type_for_extension(os.path.splitext(image_path)[1].lower())
+
+    def _open_log_handles(self, mode: str = 'a'):
+        """Open the session log files with a large write buffer"""
+        self._log_fh = open(self.session_log_file, mode, buffering=1 << 16, encoding='utf-8')
+        self._summary_fh = open(self.session_summary_file, mode, buffering=1 << 16, encoding='utf-8')
+
+    def _start_session_logs(self, mode: str = 'a'):
+        """Open the session log files and write a session header to both"""
+        self._open_log_handles(mode=mode)
+
+        # Initialize log files with headers
+        self._log_fh.write("".join([
+            f"=== Drawing Agent Session Log ===\n",
+            f"Started: {datetime.now().isoformat()}\n",
+            f"Model: {self.model}\n",
+            f"{'='*50}\n\n",
+        ]))
+
+        # The summary log is NDJSON: one record per line
+        self._write_summary_record({"event": "session_start", "ts": datetime.now().isoformat(), "model": self.model})
+
+        # Make sure buffered entries reach disk even if the session is never closed
+        atexit.register(self.close)
+
+    def _write_summary_record(self, record: Dict):
+        """Append one JSON record as a line to the summary log"""
+        self._summary_fh.write(_json_dumps(record) + "\n")
+
+    def close(self):
+        """Flush and close the session log file handles"""
+        for fh in (self._log_fh, self._summary_fh):
+            if fh is not None and not fh.closed:
+                fh.close()
+        self._log_fh = None
+        self._summary_fh = None
+        # Nothing left to flush, so don't keep this agent alive until interpreter exit
+        atexit.unregister(self.close)
 
     def _log_agent_interaction(self, canvas_image_path: str, user_question: str,
                               raw_response: str, parsed_instruction: DrawingInstruction,
@@ -201,26 +337,33 @@ class FreeDrawingAgent:
         try:
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-            # Append to full responses log
-            with open(self.session_log_file, 'a', encoding='utf-8') as f:
-                f.write(f"[{timestamp}] Step\n")
-                f.write(f"Question: {user_question}\n")
-                f.write(f"Canvas: {canvas_image_path}\n")
-                f.write(f"Parsing Success: {parsing_success}\n")
-                if error_info:
-                    f.write(f"Error: {error_info}\n")
-                f.write(f"\nRaw Response:\n{raw_response}\n")
-                f.write(f"\n{'-'*50}\n\n")
+            # A previous session was closed on this agent: start a new one in the same files
+            if self._log_fh is None:
+                self._start_session_logs()
+
+            # Append to full responses log, built up front and written once
+            parts = [
+                f"[{timestamp}] Step\n",
+                f"Question: {user_question}\n",
+                f"Canvas: {canvas_image_path}\n",
+                f"Parsing Success: {parsing_success}\n",
+            ]
+            if error_info:
+                parts.append(f"Error: {error_info}\n")
+            parts.append(f"\nRaw Response:\n{raw_response}\n")
+            parts.append(f"\n{'-'*50}\n\n")
+            self._log_fh.write("".join(parts))
 
             # Append to brush & thinking summary log
             if parsed_instruction:
-                with open(self.session_summary_file, 'a', encoding='utf-8') as f:
-                    f.write(f"[{timestamp}] Step\n")
-                    f.write(f"Brush: {parsed_instruction.brush}\n")
-                    f.write(f"Color: {parsed_instruction.color}\n")
-                    f.write(f"Strokes: {len(parsed_instruction.strokes)}\n")
-                    f.write(f"Thinking: {parsed_instruction.thinking}\n")
-                    f.write(f"\n{'-'*30}\n\n")
+                self._write_summary_record({
+                    "event": "step",
+                    "ts": timestamp,
+                    "brush": parsed_instruction.brush,
+                    "color": parsed_instruction.color,
+                    "strokes": len(parsed_instruction.strokes),
+                    "thinking": parsed_instruction.thinking
+                })
 
             print(f"📝 Interaction logged to session files")
 
@@ -245,7 +388,7 @@ class FreeDrawingAgent:
                 {
                     "type": "image_url",
                     "image_url": {
-                        "url": f"data:image/png;base64,{image_base64}"
+                        "url": f"data:{self._get_image_media_type(canvas_image_path)};base64,{image_base64}"
                     }
                 }
             ]
@@ -305,6 +448,16 @@ class FreeDrawingAgent:
             print(f"Invalid model type: {self.model_type}")
             return None
 
+    @staticmethod
+    def _fallback_action(brush: str, thinking: str, stroke: Tuple = _FALLBACK_STROKE) -> Dict:
+        """Build a fresh default action (thinking, brush, strokes) with a single stroke through the given points"""
+        x_coords, y_coords = stroke
+        return {
+            "thinking": thinking,
+            "brush": brush,
+            "strokes": [{"x": list(x_coords), "y": list(y_coords)}]
+        }
+
     def create_drawing_instruction(self, canvas_image_path: str, user_question: str = "What would you like to draw next?",with_context: bool = True, mood: str = None) -> DrawingInstruction:
         """
         Analyze the current canvas and decide what to draw next.
@@ -317,9 +470,6 @@ class FreeDrawingAgent:
             DrawingInstruction object with specific drawing instructions
         """
 
-        # Encode the canvas image
-        image_data = self.encode_image(canvas_image_path)
-
         # Prepare the user message
         user_text = ""
 
@@ -355,17 +505,7 @@ class FreeDrawingAgent:
                 print(f"Could not parse JSON from response: {raw_response}")
                 parsing_success = False
                 error_info = "JSON parsing failed - could not extract valid JSON from response"
-                print(f"Could not parse JSON from response: {raw_response}")
-                action_data = {
-                    "thinking": "Default action due to parsing failure",
-                    "brush": "marker",
-                    "strokes": [
-                        {
-                            "x": [400, 450],
-                            "y": [250, 275],
-                        }
-                    ]
-                }
+                action_data = self._fallback_action("marker", "Default action due to parsing failure")
             else:
                 parsing_success = True
 
@@ -384,18 +524,6 @@ class FreeDrawingAgent:
 
         except Exception as e:
             print(f"Error creating drawing instruction: {e}")
-            # Create a fallback instruction
-            # parsed_instruction = DrawingInstruction(
-            #     brush="marker",
-            #     color="default",
-            #     strokes=[
-            #         {
-            #             "x": [400, 450],
-            #             "y": [250, 275],
-            #         }
-            #     ],
-            #     thinking=f"Error occurred: {str(e)}"
-            # )
             parsing_success = False
             error_info = str(e)
 
@@ -414,22 +542,19 @@ class FreeDrawingAgent:
     def _is_canvas_blank(self, canvas_image_path: str) -> bool:
         """Check if the canvas is blank (first stroke)"""
         try:
+            from PIL import Image
+            import numpy as np
+
             # Open the image
             img = Image.open(canvas_image_path)
-            # Convert to RGB if needed
-            if img.mode != 'RGB':
-                img = img.convert('RGB')
+            # Blankness doesn't need color: a single grayscale channel is 3x less data
+            if img.mode != 'L':
+                img = img.convert('L')
+            img_array = np.asarray(img)
 
-            # Convert to numpy array
-            img_array = np.array(img)
-
-            # Check if the image is mostly a single background color
-            # Get the most common color (should be background)
-            unique_colors = np.unique(img_array.reshape(-1, img_array.shape[-1]), axis=0)
-
-            # If there are very few unique colors (1-3), it's likely blank
-            # This accounts for slight variations in background color due to compression
-            return len(unique_colors) <= 3
+            # A blank canvas is (almost) a single background value; the small
+            # tolerance accounts for slight variations due to compression
+            return int(np.ptp(img_array)) < 4
 
         except Exception as e:
             print(f"Warning: Could not determine if canvas is blank: {e}")
@@ -490,8 +615,6 @@ class FreeDrawingAgent:
         # Use base create_drawing_instruction with emotion context
         return self.create_drawing_instruction(canvas_image_path, user_question,mood=emotion)
 
-
-        return parsed_instruction
     def create_abstract_drawing_instruction(self, canvas_image_path: str) -> DrawingInstruction:
         """
         Create an abstract, non-representational drawing instruction.
@@ -503,9 +626,6 @@ class FreeDrawingAgent:
             DrawingInstruction object with abstract drawing instructions
         """
 
-        # Encode the canvas image
-        image_data = self.encode_image(canvas_image_path)
-
         # Prepare the user message
         user_text = "Create an abstract, non-representational doodle. Don't draw anything concrete or physical - follow your flow of creativity with pure shapes, lines, and patterns. Let your imagination guide you to create something out of this world. Output your drawing instruction in the required JSON format."
 
@@ -519,41 +639,14 @@ class FreeDrawingAgent:
         if stroke_context:
             user_text += stroke_context
 
-        user_message = {
-            "role": "user",
-            "content": [
-                {
-                    "type": "image",
-                    "source": {
-                        "type": "base64",
-                        "media_type": self._get_image_media_type(canvas_image_path),
-                        "data": image_data
-                    }
-                },
-                {
-                    "type": "text",
-                    "text": user_text
-                }
-            ]
-        }
-
         raw_response = ""
         parsed_instruction = None
         parsing_success = False
         error_info = None
 
         try:
-            # Create the response using Anthropic client
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=6000,
-                temperature=1,
-                messages=[user_message],
-                system=self._get_abstract_system_prompt()
-            )
-
-            # Extract the response content
-            raw_response = response.content[0].text
+            # Build the image + text message through the shared per-model helper
+            raw_response = self.create_messages(canvas_image_path, user_text, self._get_abstract_system_prompt())
 
             # Parse the JSON response
             action_data = self._parse_json_response(raw_response)
@@ -563,17 +656,8 @@ class FreeDrawingAgent:
                 print(f"Could not parse JSON from response: {raw_response}")
                 parsing_success = False
                 error_info = "JSON parsing failed - could not extract valid JSON from response"
-                print(f"Could not parse JSON from response: {raw_response}")
-                action_data = {
-                    "thinking": "Default abstract action due to parsing failure",
-                    "brush": "crayon",
-                    "strokes": [
-                        {
-                            "x": [400, 450, 500],
-                            "y": [250, 200, 275],
-                        }
-                    ]
-                }
+                action_data = self._fallback_action("crayon", "Default abstract action due to parsing failure",
+                                                    self._ABSTRACT_FALLBACK_STROKE)
             else:
                 parsing_success = True
 
@@ -598,15 +682,9 @@ class FreeDrawingAgent:
 
             # Create a fallback instruction
             parsed_instruction = DrawingInstruction(
-                brush="crayon",
                 color="default",
-                strokes=[
-                    {
-                        "x": [400, 450, 500],
-                        "y": [250, 200, 275],
-                    }
-                ],
-                thinking=f"Fallback abstract instruction due to error: {str(e)}"
+                **self._fallback_action("crayon", f"Fallback abstract instruction due to error: {str(e)}",
+                                        self._ABSTRACT_FALLBACK_STROKE)
             )
 
         # Track stroke history for spatial reasoning (before logging)
@@ -627,7 +705,7 @@ class FreeDrawingAgent:
 
     def _get_system_prompt(self) -> str:
         """Return the system prompt for the drawing agent"""
-        color_palette_info = self.get_color_palette_description()
+        color_palette_info = self.color_palette_description
 
         return f"""You are a creative artist who loves to doodle! Draw whatever feels fun and interesting to you right now. Let your imagination run free. You have access to a digital canvas and a set of drawing tools. Select brushes, adjust their color, make strokes, and create whatever you want. Observe your work and think as you draw.
 The canvas and tools you can utilize is listed below:
@@ -661,7 +739,7 @@ For marker/crayon/wiggle: use palette colors. For spray/fountain: use “default
 
     def _get_emotion_system_prompt(self, mood = None) -> str:
         assert mood != None
-        color_palette_info = self.get_color_palette_description()
+        color_palette_info = self.color_palette_description
         return f"""You are a creative artist who channels emotions through visual expression. Your feeling {mood} will guide you through your doodle and motivate your thinking. Build a cohesive emotional narrative with each stroke. 
         You have access to a digital canvas and a set of drawing tools. Select brushes, adjust their color, make strokes, and create whatever you want. Observe your work and think as you draw.
 The canvas and tools you can utilize is listed below:
@@ -748,8 +826,8 @@ For marker/crayon/wiggle: use palette colors. For spray/fountain: use "default".
                 y_coords = y_coords[:min_len]
 
                 # Clamp coordinates to canvas bounds
-                x_coords = [max(0, min(850, float(x))) for x in x_coords]
-                y_coords = [max(0, min(500, float(y))) for y in y_coords]
+                x_coords = _clamp_coords(x_coords, 850, as_float=True)
+                y_coords = _clamp_coords(y_coords, 500, as_float=True)
 
                 validated_strokes.append({
                     "x": x_coords,
@@ -810,8 +888,8 @@ For marker/crayon/wiggle: use palette colors. For spray/fountain: use "default".
                 y_coords = y_coords[:min_len]
 
                 # Clamp coordinates to canvas bounds
-                x_coords = [max(0, min(850, float(x))) for x in x_coords]
-                y_coords = [max(0, min(500, float(y))) for y in y_coords]
+                x_coords = _clamp_coords(x_coords, 850, as_float=True)
+                y_coords = _clamp_coords(y_coords, 500, as_float=True)
 
                 # Ensure at least 2 points for a stroke
                 if len(x_coords) >= 2:
@@ -839,20 +917,27 @@ For marker/crayon/wiggle: use palette colors. For spray/fountain: use "default".
 
     def _parse_json_response(self, content: str) -> Optional[Dict]:
         """Parse JSON from the response content, handling multiple JSON objects by taking the first one"""
-        import re
-
         # Method 1: Try to extract JSON from markdown code blocks first
-        json_pattern = r'```(?:json)?\s*(\{.*?\})\s*```'
-        matches = re.findall(json_pattern, content, re.DOTALL)
-        if matches:
+        match = _JSON_FENCE_RE.search(content)
+        if match:
             try:
                 # Clean the extracted JSON first
-                cleaned_json = self._clean_json_string(matches[0])
-                return json.loads(cleaned_json)
+                cleaned_json = self._clean_json_string(match.group(1))
+                return _json_loads(cleaned_json)
             except json.JSONDecodeError:
                 pass
 
-        # Method 2: Find the first complete JSON object
+        # Method 2: Fast path for a single well-formed object - one linear regex
+        # scan and one C-level parse, no per-character Python loop or cleaning
+        match = _JSON_SPAN_RE.search(content)
+        if match is None:
+            return None
+        try:
+            return _json_loads(match.group(0))
+        except json.JSONDecodeError:
+            pass
+
+        # Method 3: Find the first complete JSON object
         # First, do a preliminary cleaning to handle smart quotes before brace counting
         pre_cleaned_content = self._preliminary_clean(content)
         
@@ -897,7 +982,7 @@ For marker/crayon/wiggle: use palette colors. For spray/fountain: use "default".
             cleaned_json = self._clean_json_string(json_str)
             
             try:
-                return json.loads(cleaned_json)
+                return _json_loads(cleaned_json)
             except json.JSONDecodeError as e:
                 print(f"JSON parsing error even after cleaning: {e}")
                 
@@ -924,8 +1009,7 @@ For marker/crayon/wiggle: use palette colors. For spray/fountain: use "default".
         
         # Try to extract position info from error message
         error_pos = None
-        import re
-        pos_match = re.search(r'char (\d+)', str(error))
+        pos_match = _ERROR_POS_RE.search(str(error))
         if pos_match:
             error_pos = int(pos_match.group(1))
             print(f"Error position: {error_pos}")
@@ -966,8 +1050,6 @@ For marker/crayon/wiggle: use palette colors. For spray/fountain: use "default".
     
     def _clean_json_string(self, json_str: str) -> str:
         """Enhanced JSON string cleaning with better quote and newline handling"""
-        import re
-        
         # Step 1: Replace all types of smart quotes with regular ASCII quotes
         smart_quote_mappings = {
             # Double quotes
@@ -1022,10 +1104,8 @@ For marker/crayon/wiggle: use palette colors. For spray/fountain: use "default".
             fixed = fixed.replace('\r', '\\r')
             return fixed
         
-        # Use a more comprehensive regex to match quoted strings
-        # This handles escaped quotes within strings
-        string_pattern = r'"(?:[^"\\]|\\[\\"/bfnrt]|\\u[0-9a-fA-F]{4})*"'
-        json_str = re.sub(string_pattern, fix_string_content, json_str)
+        # Match quoted strings, including escaped quotes within them
+        json_str = _JSON_STRING_RE.sub(fix_string_content, json_str)
         
         # Step 4: Clean up any remaining control characters that might cause issues
         # Remove control characters except for necessary ones (tab, newline, carriage return)
@@ -1059,8 +1139,6 @@ For marker/crayon/wiggle: use palette colors. For spray/fountain: use "default".
     
     def _fix_json_structure(self, json_str: str) -> str:
         """Fix common JSON structural problems"""
-        import re
-        
         # First, let's analyze the bracket/brace structure
         structure_analysis = self._analyze_json_structure(json_str)
         
@@ -1203,11 +1281,8 @@ For marker/crayon/wiggle: use palette colors. For spray/fountain: use "default".
     
     def _fix_malformed_arrays(self, json_str: str) -> str:
         """Fix common array malformation issues"""
-        # Fix trailing commas in arrays and objects
-        import re
-        
         # Remove trailing commas before closing brackets/braces
-        json_str = re.sub(r',(\s*[}\]])', r'\1', json_str)
+        json_str = _TRAILING_COMMA_RE.sub(r'\1', json_str)
         
         return json_str
 
@@ -1257,8 +1332,8 @@ For marker/crayon/wiggle: use palette colors. For spray/fountain: use "default".
                 y_coords = y_coords[:min_len]
 
                 # Clamp coordinates to canvas bounds
-                x_coords = [max(0, min(850, x)) for x in x_coords]
-                y_coords = [max(0, min(500, y)) for y in y_coords]
+                x_coords = _clamp_coords(x_coords, 850)
+                y_coords = _clamp_coords(y_coords, 500)
 
                 # Ensure at least 2 points for a stroke
                 if len(x_coords) >= 2:
@@ -1287,8 +1362,6 @@ For marker/crayon/wiggle: use palette colors. For spray/fountain: use "default".
     def _track_brush_usage(self, brush: str):
         """Track brush usage for variety encouragement"""
         self.recent_brushes.append(brush)
-        if len(self.recent_brushes) > self.max_brush_history:
-            self.recent_brushes.pop(0)
 
     def _track_stroke_history(self, instruction: DrawingInstruction):
         """Track stroke history for spatial reasoning"""
@@ -1300,12 +1373,9 @@ For marker/crayon/wiggle: use palette colors. For spray/fountain: use "default".
                 "x_coords": stroke.get("x", []),
                 "y_coords": stroke.get("y", []),
             }
+            # The deque drops the oldest strokes once max_stroke_history is reached
             self.stroke_history.append(stroke_info)
 
-        # Keep only recent strokes
-        if len(self.stroke_history) > self.max_stroke_history:
-            self.stroke_history = self.stroke_history[-self.max_stroke_history:]
-
     def _get_stroke_history_context(self) -> str:
         """Get spatial context from previous strokes"""
         if not self.stroke_history:
@@ -1358,14 +1428,15 @@ For marker/crayon/wiggle: use palette colors. For spray/fountain: use "default".
         # Find most used brush
         most_used = max(brush_counts.items(), key=lambda x: x[1])
 
-        context = f"\n\nBRUSH VARIETY CONTEXT: You've recently used these brushes: {', '.join(self.recent_brushes[-3:])}. "
+        recent = list(self.recent_brushes)
+        context = f"\n\nBRUSH VARIETY CONTEXT: You've recently used these brushes: {', '.join(recent[-3:])}. "
 
         if most_used[1] >= 3:
             context += f"Consider trying a different brush - you've used '{most_used[0]}' {most_used[1]} times recently. "
 
         # Suggest alternative brushes
         available_brushes = ["marker", "crayon", "wiggle", "spray", "fountain"]
-        unused_brushes = [b for b in available_brushes if b not in self.recent_brushes[-2:]]
+        unused_brushes = [b for b in available_brushes if b not in recent[-2:]]
         if unused_brushes:
             context += f"Try one of these unused brushes: {', '.join(unused_brushes[:2])}. "
 
@@ -1376,20 +1447,24 @@ For marker/crayon/wiggle: use palette colors. For spray/fountain: use "default".
         if not self.enable_logging or not self.session_log_file:
             return
 
+        # Nothing was logged since the last close
+        if self._log_fh is None:
+            self.reset_stroke_history()
+            return
+
         try:
             end_time = datetime.now()
 
             # Add session end to both log files
-            with open(self.session_log_file, 'a', encoding='utf-8') as f:
-                f.write(f"\n{'='*50}\n")
-                f.write(f"Session ended: {end_time.isoformat()}\n")
-                f.write(f"=== End of Drawing Agent Session Log ===\n")
+            self._log_fh.write("".join([
+                f"\n{'='*50}\n",
+                f"Session ended: {end_time.isoformat()}\n",
+                f"=== End of Drawing Agent Session Log ===\n",
+            ]))
 
-            with open(self.session_summary_file, 'a', encoding='utf-8') as f:
-                f.write(f"\n{'='*50}\n")
-                f.write(f"Session ended: {end_time.isoformat()}\n")
-                f.write(f"=== End of Drawing Agent Session Summary ===\n")
+            self._write_summary_record({"event": "session_end", "ts": end_time.isoformat()})
 
+            self.close()
             print(f"📝 Session logs finalized")
 
         except Exception as e:
@@ -1400,12 +1475,13 @@ For marker/crayon/wiggle: use palette colors. For spray/fountain: use "default".
 
     def reset_stroke_history(self):
         """Reset stroke history for a new drawing session"""
-        self.stroke_history = []
-        self.recent_brushes = []
+        self.stroke_history.clear()
+        self.recent_brushes.clear()
         print("🔄 Stroke history reset for new session")
 
-    def get_color_palette_description(self) -> str:
-        """Get a formatted description of the color palette for the LLM"""
+    @functools.cached_property
+    def color_palette_description(self) -> str:
+        """Formatted description of the color palette for the LLM, built once per agent"""
         palette_desc = "**AVAILABLE COLOR PALETTE:**\n"
         palette_desc += "Choose colors from this curated palette for marker, crayon, and wiggle brushes:\n\n"
 
@@ -6,7 +6,6 @@ Processes JSON files from happy, angry, and sad mood directories.
 
 import os
 import json
-import glob
 from collections import defaultdict, Counter
 from typing import Dict, List, Any, Tuple
 import matplotlib
@@ -18,20 +17,36 @@ import numpy as np
 from utils.simple_eval import get_color_group, COLOR_PALETTE
 from unified_analysis import preprocess_json_to_stroke_format
 
-def load_json_files(directory_path: str) -> List[Tuple[str, Dict[str, Any]]]:
+def list_json_files(directory_path: str) -> List[str]:
+    """
+    List the JSON files in a directory with a single scandir pass.
+    
+    Args:
+        directory_path: Path to directory containing JSON files
+        
+    Returns:
+        List of JSON file paths
+    """
+    with os.scandir(directory_path) as entries:
+        return [entry.path for entry in entries
+                if entry.name.endswith(".json") and not entry.name.startswith(".") and entry.is_file()]
+
+def load_json_files(directory_path: str, file_paths: List[str] = None) -> List[Tuple[str, Dict[str, Any]]]:
     """
     Load all JSON files from a directory.
     
     Args:
         directory_path: Path to directory containing JSON files
+        file_paths: Already-listed JSON files in the directory (listed here if omitted)
         
     Returns:
         List of tuples containing (filename, json_data)
     """
     json_files = []
-    json_pattern = os.path.join(directory_path, "*.json")
+    if file_paths is None:
+        file_paths = list_json_files(directory_path)
     
-    for file_path in glob.glob(json_pattern):
+    for file_path in file_paths:
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 json_data = json.load(f)
@@ -42,12 +57,14 @@ def load_json_files(directory_path: str) -> List[Tuple[str, Dict[str, Any]]]:
             
     return json_files
 
-def analyze_color_usage_by_mood(mood_directories: Dict[str, str]) -> Dict[str, Dict[str, int]]:
+def analyze_color_usage_by_mood(mood_directories: Dict[str, str],
+                                mood_file_paths: Dict[str, List[str]] = None) -> Dict[str, Dict[str, int]]:
     """
     Analyze color usage across different mood directories.
     
     Args:
         mood_directories: Dictionary mapping mood names to directory paths
+        mood_file_paths: Optional pre-listed JSON files per mood, to avoid listing directories again
         
     Returns:
         Dictionary mapping mood names to color usage counts
@@ -58,7 +75,8 @@ def analyze_color_usage_by_mood(mood_directories: Dict[str, str]) -> Dict[str, D
         print(f"\nAnalyzing {mood} mood...")
         
         # Load all JSON files from the mood directory
-        json_files = load_json_files(directory_path)
+        file_paths = mood_file_paths.get(mood) if mood_file_paths else None
+        json_files = load_json_files(directory_path, file_paths)
         print(f"Found {len(json_files)} JSON files for {mood} mood")
         
         # Initialize color counter for this mood
@@ -331,12 +349,13 @@ def main():
         "sad": os.path.join(base_path, "sad", "json")
     }
     
-    # Check if directories exist and have files
+    # Check if directories exist and have files; the listing is reused for the analysis
+    mood_file_paths = {}
     for mood, path in mood_directories.items():
         if not os.path.exists(path):
             print(f"Error: Directory {path} does not exist")
             return
-        json_files = glob.glob(os.path.join(path, "*.json"))
+        json_files = mood_file_paths[mood] = list_json_files(path)
         print(f"Found {len(json_files)} JSON files in {path}")
         if len(json_files) == 0:
             print(f"Warning: No JSON files found in {path}")
@@ -344,7 +363,7 @@ def main():
     print("Starting color usage analysis across mood-based drawings...")
     
     # Analyze color usage
-    mood_color_analysis = analyze_color_usage_by_mood(mood_directories)
+    mood_color_analysis = analyze_color_usage_by_mood(mood_directories, mood_file_paths)
     
     # Print results
     print_analysis_results(mood_color_analysis)
@@ -10,10 +10,34 @@ import glob
 from datetime import datetime
 from typing import List, Dict, Optional
 import re
+import heapq
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from drawing_canvas_bridge import DrawingCanvasBridge
 from free_drawing_agent import DrawingInstruction
 import time
 
+# Optional: orjson is a faster drop-in for parsing logged responses
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Session log patterns, compiled once rather than on every call
+_STEP_HEADER_RE = re.compile(r'^\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\] Step$')
+_STEP_SEPARATOR = '-' * 50
+_RAW_JSON_RE = re.compile(r'Raw Response:\n(\{.*?\n\})', re.DOTALL)
+_TRAILING_COMMA_RE = re.compile(r',\s*([}\]])')
+# The flat "parsing" object of a JSON log file (strings may contain braces)
+_PARSING_SECTION_RE = re.compile(rb'"parsing"\s*:\s*(\{(?:[^{}"]|"(?:[^"\\]|\\.)*")*\})')
+_REQUIRED_INSTRUCTION_KEYS = ("brush", "color", "strokes", "thinking")
+
+def _json_loads(text):
+    """Parse JSON with orjson when available, falling back to the stdlib"""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
 class AgentLogViewer:
     """Utility class for viewing and analyzing agent logs"""
 
@@ -24,22 +48,48 @@ class AgentLogViewer:
         """List all log files, sorted by timestamp (newest first)"""
         pattern = os.path.join(self.log_directory, "agent_response_*.json")
         log_files = glob.glob(pattern)
-        log_files.sort(reverse=True)  # Newest first
 
+        # Newest first; with a limit only the top entries are selected instead of sorting everything
         if limit:
-            log_files = log_files[:limit]
-
+            return heapq.nlargest(limit, log_files)
+        log_files.sort(reverse=True)
         return log_files
 
     def load_log(self, log_file: str) -> Optional[Dict]:
         """Load a single log file"""
         try:
-            with open(log_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            # Read raw bytes: orjson parses them directly, and json.loads detects the UTF-8 encoding
+            with open(log_file, 'rb') as f:
+                return _json_loads(f.read())
         except Exception as e:
             print(f"Error loading log file {log_file}: {e}")
             return None
 
+    def load_parsing_info(self, log_file: str) -> Optional[Dict]:
+        """Load only the "parsing" section of a log file, without parsing the full response payload"""
+        try:
+            with open(log_file, 'rb') as f:
+                content = f.read()
+            match = _PARSING_SECTION_RE.search(content)
+            if match:
+                return _json_loads(match.group(1))
+        except Exception:
+            pass
+        # Fall back to a full parse for anything the scan does not recognize
+        log_data = self.load_log(log_file)
+        if log_data is None:
+            return None
+        return log_data.get('parsing', {})
+
+    def load_logs(self, log_files: List[str], max_workers: int = 8, loader=None) -> List[Optional[Dict]]:
+        """Load several log files concurrently, returning results in the same order"""
+        loader = loader or self.load_log
+        if len(log_files) <= 1:
+            return [loader(log_file) for log_file in log_files]
+        # Loading is mostly file I/O, so threads overlap the reads
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(log_files))) as executor:
+            return list(executor.map(loader, log_files))
+
     def show_recent_logs(self, count: int = 10):
         """Show summary of recent log files"""
         log_files = self.list_log_files(limit=count)
@@ -154,17 +204,16 @@ class AgentLogViewer:
 
         success_count = 0
         total_count = len(log_files)
-        error_types = {}
+        error_types = Counter()
 
-        for log_file in log_files:
-            log_data = self.load_log(log_file)
-            if log_data:
-                parsing = log_data.get('parsing', {})
+        # Only the "parsing" section is needed, so skip decoding the response payloads
+        for parsing in self.load_logs(log_files, loader=self.load_parsing_info):
+            if parsing is not None:
                 if parsing.get('success'):
                     success_count += 1
                 else:
                     error_info = parsing.get('error_info', 'Unknown error')
-                    error_types[error_info] = error_types.get(error_info, 0) + 1
+                    error_types[error_info] += 1
 
         success_rate = (success_count / total_count) * 100 if total_count > 0 else 0
 
@@ -175,7 +224,7 @@ class AgentLogViewer:
 
         if error_types:
             print("Error Types:")
-            for error, count in sorted(error_types.items(), key=lambda x: x[1], reverse=True):
+            for error, count in error_types.most_common():
                 percentage = (count / total_count) * 100
                 print(f"  • {error}: {count} times ({percentage:.1f}%)")
         else:
@@ -193,8 +242,7 @@ class AgentLogViewer:
             f.write(f"Agent Responses Export - {datetime.now().isoformat()}\n")
             f.write("=" * 80 + "\n\n")
 
-            for i, log_file in enumerate(log_files, 1):
-                log_data = self.load_log(log_file)
+            for i, log_data in enumerate(self.load_logs(log_files), 1):
                 if log_data:
                     f.write(f"Response #{i} - {log_data.get('timestamp', 'Unknown')}\n")
                     f.write("-" * 60 + "\n")
@@ -207,21 +255,52 @@ class AgentLogViewer:
 
         print(f"📄 Exported {len(log_files)} responses to: {output_file}")
 
+def _parse_step_instruction(step: str) -> Optional[Dict]:
+    """Parse the raw response of one logged step into instruction data, or None if unusable"""
+    match = _RAW_JSON_RE.search(step)
+    if not match:
+        return None
+    block = match.group(1)
+    try:
+        try:
+            data = _json_loads(block)
+        except json.JSONDecodeError:
+            # Only pay for the trailing-comma cleanup when the raw block fails
+            data = _json_loads(_TRAILING_COMMA_RE.sub(r'\1', block))
+    except Exception as e:
+        print(f"Error parsing JSON block: {e}")
+        return None
+    # Only keep responses that have the required fields
+    if not isinstance(data, dict) or not all(k in data for k in _REQUIRED_INSTRUCTION_KEYS):
+        return None
+    return data
+
+def _iter_step_blocks(f):
+    """Yield (timestamp, block) for each logged step, reading the file line by line"""
+    timestamp = None
+    lines = []
+    for line in f:
+        stripped = line.rstrip('\n')
+        header = _STEP_HEADER_RE.match(stripped)
+        if header or stripped == _STEP_SEPARATOR:
+            if timestamp is not None:
+                yield timestamp, "".join(lines)
+            timestamp = header.group(1) if header else None
+            lines = []
+        elif timestamp is not None:
+            lines.append(line)
+    if timestamp is not None:
+        yield timestamp, "".join(lines)
+
 def extract_instructions_from_log(log_file):
     """Extract drawing instructions from a session log file."""
     instructions = []
     with open(log_file, 'r', encoding='utf-8') as f:
-        content = f.read()
-        # Find all JSON blocks in the log
-        json_blocks = re.findall(r'\\{[\\s\\S]*?\\}', content)
-        for block in json_blocks:
-            try:
-                data = json.loads(block)
-                # Only add if it has the required fields
-                if all(k in data for k in ["brush", "color", "strokes", "thinking"]):
-                    instructions.append(data)
-            except Exception as e:
-                print(f"Error parsing JSON block: {e}")
+        # Parse the raw JSON response of each logged step, one step in memory at a time
+        for _timestamp, step in _iter_step_blocks(f):
+            data = _parse_step_instruction(step)
+            if data is not None:
+                instructions.append(data)
     return instructions
 
 def create_drawing_instruction_from_json(json_data):
@@ -6,187 +6,217 @@ and compiles comparative statistics based only on utils/eval.py metrics.
 
 import os
 import json
+import argparse
 import subprocess
-import pandas as pd
+import threading
+from datetime import datetime
 import numpy as np
 from typing import Dict, List, Any
 
+# Optional: orjson decodes and encodes the large eval result files much faster
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _load_json_file(path: str):
+    """Read a JSON file with orjson when available, falling back to the stdlib."""
+    with open(path, 'rb') as f:
+        if orjson is not None:
+            return orjson.loads(f.read())
+        return json.load(f)
+
+def _dump_json_file(obj, path: str):
+    """Write obj as indented JSON with orjson when available, falling back to the stdlib."""
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(path, 'w') as f:
+            json.dump(obj, f, indent=2)
+
+# (label, working directory, command) for each analysis job; the jobs read
+# disjoint datasets and write disjoint result files, so they can run together
+UNIFIED_ANALYSIS_JOB = ("unified", ".", ['python', 'unified_analysis.py', '--dataset', 'all'])
+EVAL_JOBS = [
+    ("custom", "../tests", ['python', 'test_custom_outputs.py']),
+    ("human", "../tests", ['python', 'test_human_outputs.py']),
+]
+
+def _stream_output(label: str, process: subprocess.Popen):
+    """Print a child's output line by line, tagged with its job label."""
+    for line in process.stdout:
+        print(f"[{label}] {line}", end="")
+    process.stdout.close()
+
+def _run_jobs(jobs) -> bool:
+    """Run analysis jobs concurrently, streaming their tagged output as it arrives."""
+    # Unbuffered children so their progress shows up while they run
+    env = dict(os.environ, PYTHONUNBUFFERED="1")
+    success = True
+    running = []
+    for label, cwd, command in jobs:
+        try:
+            process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                       text=True, bufsize=1, cwd=cwd, env=env)
+        except Exception as e:
+            print(f"Error starting {label} analysis: {e}")
+            success = False
+            continue
+        reader = threading.Thread(target=_stream_output, args=(label, process), daemon=True)
+        reader.start()
+        running.append((label, process, reader))
+
+    for label, process, reader in running:
+        reader.join()
+        if process.wait() != 0:
+            print(f"{label} analysis exited with code {process.returncode}")
+            success = False
+
+    return success
+
 def run_unified_analysis():
     """Run the unified analysis script for all datasets."""
     print("=== Running Unified Analysis for All Datasets ===")
-    try:
-        result = subprocess.run(['python', 'unified_analysis.py', '--dataset', 'all'], 
-                              capture_output=True, text=True, cwd='.')
-        print(result.stdout)
-        if result.stderr:
-            print("Errors:", result.stderr)
-        success = result.returncode == 0
-    except Exception as e:
-        print(f"Error running unified analysis: {e}")
-        success = False
-    
-    return success
+    return _run_jobs([UNIFIED_ANALYSIS_JOB])
+
+def run_analysis_scripts():
+    """Run the unified analysis together with the custom and human evaluations."""
+    print("=== Running Unified Analysis and Custom/Human Evaluations in Parallel ===")
+    return _run_jobs([UNIFIED_ANALYSIS_JOB] + EVAL_JOBS)
 
 def load_analysis_results(stats_dir: str) -> tuple:
     """Load the results from unified analysis."""
-    custom_detailed = None
-    human_detailed = None
-    random_detailed = None
-    
-    # Load detailed results
-    custom_detailed_path = os.path.join(stats_dir, "custom_eval_results.json")
-    if os.path.exists(custom_detailed_path):
-        with open(custom_detailed_path, 'r') as f:
-            data = json.load(f)
-            # Handle new format with separate stroke_analysis and image_analysis
-            if isinstance(data, dict) and "stroke_analysis" in data:
-                custom_detailed = data["stroke_analysis"]
-            else:
-                # Backward compatibility with old format
-                custom_detailed = data
-    
-    human_detailed_path = os.path.join(stats_dir, "human_eval_results.json")
-    if os.path.exists(human_detailed_path):
-        with open(human_detailed_path, 'r') as f:
-            data = json.load(f)
-            # Handle new format with separate stroke_analysis and image_analysis
-            if isinstance(data, dict) and "stroke_analysis" in data:
-                human_detailed = data["stroke_analysis"]
-            else:
-                # Backward compatibility with old format
-                human_detailed = data
-    
-    random_detailed_path = os.path.join(stats_dir, "random_eval_results.json")
-    if os.path.exists(random_detailed_path):
-        with open(random_detailed_path, 'r') as f:
-            data = json.load(f)
+    results = []
+    for dataset in ["custom", "human", "random"]:
+        detailed = None
+        detailed_path = os.path.join(stats_dir, f"{dataset}_eval_results.json")
+        if os.path.exists(detailed_path):
+            data = _load_json_file(detailed_path)
             # Handle new format with separate stroke_analysis and image_analysis
             if isinstance(data, dict) and "stroke_analysis" in data:
-                random_detailed = data["stroke_analysis"]
+                detailed = data["stroke_analysis"]
             else:
                 # Backward compatibility with old format
-                random_detailed = data
-    
+                detailed = data
+        results.append(detailed)
+
+    custom_detailed, human_detailed, random_detailed = results
     return custom_detailed, human_detailed, random_detailed
 
 def load_image_analysis_results(stats_dir: str) -> tuple:
     """Load the image analysis results from unified analysis."""
-    custom_images = []
-    human_images = []
-    random_images = []
-    
-    # Load image analysis results
-    custom_detailed_path = os.path.join(stats_dir, "custom_eval_results.json")
-    if os.path.exists(custom_detailed_path):
-        with open(custom_detailed_path, 'r') as f:
-            data = json.load(f)
-            if isinstance(data, dict) and "image_analysis" in data and data["image_analysis"]:
-                custom_images = data["image_analysis"]
-    
-    human_detailed_path = os.path.join(stats_dir, "human_eval_results.json")
-    if os.path.exists(human_detailed_path):
-        with open(human_detailed_path, 'r') as f:
-            data = json.load(f)
-            if isinstance(data, dict) and "image_analysis" in data and data["image_analysis"]:
-                human_images = data["image_analysis"]
-    
-    random_detailed_path = os.path.join(stats_dir, "random_eval_results.json")
-    if os.path.exists(random_detailed_path):
-        with open(random_detailed_path, 'r') as f:
-            data = json.load(f)
+    results = []
+    for dataset in ["custom", "human", "random"]:
+        images = []
+        detailed_path = os.path.join(stats_dir, f"{dataset}_eval_results.json")
+        if os.path.exists(detailed_path):
+            data = _load_json_file(detailed_path)
             if isinstance(data, dict) and "image_analysis" in data and data["image_analysis"]:
-                random_images = data["image_analysis"]
-    
+                images = data["image_analysis"]
+        results.append(images)
+
+    custom_images, human_images, random_images = results
     return custom_images, human_images, random_images
 
-def analyze_spatial_correlation_comparison(custom_detailed: List[Dict], human_detailed: List[Dict], random_detailed: List[Dict]) -> Dict:
-    """Compare spatial correlation metrics between custom, human, and random data."""
-    comparison = {
-        "custom": {"mean_distances": [], "num_color_pairs": []},
-        "human": {"mean_distances": [], "num_color_pairs": []},
-        "random": {"mean_distances": [], "num_color_pairs": []}
+CLUSTERING_TYPES = ["color_clustering", "brush_clustering"]
+
+def _accumulate_results(results: List[Dict]) -> Dict:
+    """Collect the stroke, hue entropy, spatial and clustering metrics of one dataset in a single pass."""
+    strokes = []
+    hue_entropies = []
+    mean_distances = []
+    num_color_pairs = []
+    clustering = {
+        clustering_type: {"num_clusters": [], "avg_cluster_size": [], "intra_cluster_distances": []}
+        for clustering_type in CLUSTERING_TYPES
     }
 
-    # Analyze custom data
-    # Process each dataset type
-    for dataset_type, data in [("custom", custom_detailed), ("human", human_detailed), ("random", random_detailed)]:
-        if data:
-            for result in data:
-                spatial_corr = result.get("spatial_correlation", {})
-                for metrics in spatial_corr.values():
-                    comparison[dataset_type]["mean_distances"].append(metrics["mean_distance"])
-                    comparison[dataset_type]["num_color_pairs"].append(metrics["num_pairs"])
-    
+    for result in results or []:
+        strokes.append(result["total_strokes"])
+        hue_entropy = result.get("hue_entropy")
+        if hue_entropy is not None:
+            hue_entropies.append(hue_entropy)
+
+        for metrics in result.get("spatial_correlation", {}).values():
+            mean_distances.append(metrics["mean_distance"])
+            num_color_pairs.append(metrics["num_pairs"])
+
+        for clustering_type in CLUSTERING_TYPES:
+            acc = clustering[clustering_type]
+            for metrics in result.get(clustering_type, {}).values():
+                acc["num_clusters"].append(metrics["num_clusters"])
+                sizes = metrics["cluster_sizes"]
+                if sizes:
+                    acc["avg_cluster_size"].append(sum(sizes) / len(sizes))
+                distance = metrics.get("avg_intra_cluster_distance", 0)
+                if distance > 0:
+                    acc["intra_cluster_distances"].append(distance)
+
+    accumulated = {
+        "strokes": np.asarray(strokes, dtype=np.float64),
+        "hue_entropies": np.asarray(hue_entropies, dtype=np.float64),
+        "mean_distances": np.asarray(mean_distances, dtype=np.float64),
+        "num_color_pairs": np.asarray(num_color_pairs, dtype=np.float64),
+    }
+    for clustering_type, acc in clustering.items():
+        accumulated[clustering_type] = {
+            metric: np.asarray(values, dtype=np.float64) for metric, values in acc.items()
+        }
+    return accumulated
+
+def _accumulate_datasets(custom_detailed: List[Dict], human_detailed: List[Dict], random_detailed: List[Dict]) -> Dict:
+    """Accumulate the metrics of every dataset, keyed by dataset name."""
+    return {
+        "custom": _accumulate_results(custom_detailed),
+        "human": _accumulate_results(human_detailed),
+        "random": _accumulate_results(random_detailed)
+    }
+
+def analyze_spatial_correlation_comparison(custom_detailed: List[Dict], human_detailed: List[Dict], random_detailed: List[Dict],
+                                           accumulated: Dict = None) -> Dict:
+    """Compare spatial correlation metrics between custom, human, and random data."""
+    if accumulated is None:
+        accumulated = _accumulate_datasets(custom_detailed, human_detailed, random_detailed)
+
     # Calculate summary statistics
     summary = {}
     for dataset in ["custom", "human", "random"]:
-        if comparison[dataset]["mean_distances"]:
+        distances = accumulated[dataset]["mean_distances"]
+        if distances.size:
             summary[dataset] = {
-                "avg_mean_distance": np.mean(comparison[dataset]["mean_distances"]),
-                "std_mean_distance": np.std(comparison[dataset]["mean_distances"]),
-                "total_color_pairs": len(comparison[dataset]["mean_distances"]),
-                "avg_pairs_per_color": np.mean(comparison[dataset]["num_color_pairs"])
+                "avg_mean_distance": distances.mean(),
+                "std_mean_distance": distances.std(),
+                "total_color_pairs": distances.size,
+                "avg_pairs_per_color": accumulated[dataset]["num_color_pairs"].mean()
             }
         else:
             summary[dataset] = {"no_data": True}
 
     return summary
 
-def analyze_clustering_comparison(custom_detailed: List[Dict], human_detailed: List[Dict], random_detailed: List[Dict]) -> Dict:
+def analyze_clustering_comparison(custom_detailed: List[Dict], human_detailed: List[Dict], random_detailed: List[Dict],
+                                  accumulated: Dict = None) -> Dict:
     """Compare clustering metrics between custom, human, and random data."""
-    comparison = {
-        "color_clustering": {},
-        "brush_clustering": {}
-    }
-    
-    # Initialize metrics for each dataset type
-    metrics = ["num_clusters", "avg_cluster_size", "intra_cluster_distances"]
-    dataset_types = ["custom", "human", "random"]
-    
-    for clustering_type in ["color_clustering", "brush_clustering"]:
-        comparison[clustering_type] = {
-            dataset: {metric: [] for metric in metrics}
-            for dataset in dataset_types
-        }
+    if accumulated is None:
+        accumulated = _accumulate_datasets(custom_detailed, human_detailed, random_detailed)
 
-    # Analyze custom data
-    # Process each dataset type
-    for dataset_type, dataset in [("custom", custom_detailed), ("human", human_detailed), ("random", random_detailed)]:
-        if not dataset:
-            continue
-            
-        for result in dataset:
-            # Process color clustering
-            color_clustering = result.get("color_clustering", {})
-            for color, metrics in color_clustering.items():
-                comparison["color_clustering"][dataset_type]["num_clusters"].append(metrics["num_clusters"])
-                if metrics["cluster_sizes"]:
-                    comparison["color_clustering"][dataset_type]["avg_cluster_size"].append(np.mean(metrics["cluster_sizes"]))
-                if metrics.get("avg_intra_cluster_distance", 0) > 0:
-                    comparison["color_clustering"][dataset_type]["intra_cluster_distances"].append(metrics["avg_intra_cluster_distance"])
-            
-            # Process brush clustering
-            brush_clustering = result.get("brush_clustering", {})
-            for brush, metrics in brush_clustering.items():
-                comparison["brush_clustering"][dataset_type]["num_clusters"].append(metrics["num_clusters"])
-                if metrics["cluster_sizes"]:
-                    comparison["brush_clustering"][dataset_type]["avg_cluster_size"].append(np.mean(metrics["cluster_sizes"]))
-                if metrics.get("avg_intra_cluster_distance", 0) > 0:
-                    comparison["brush_clustering"][dataset_type]["intra_cluster_distances"].append(metrics["avg_intra_cluster_distance"])
-    # Calculate summary statistics
     summary = {}
-    for clustering_type in ["color_clustering", "brush_clustering"]:
+    for clustering_type in CLUSTERING_TYPES:
         summary[clustering_type] = {}
         for dataset in ["custom", "human", "random"]:
-            data = comparison[clustering_type][dataset]
-            if data["num_clusters"]:
+            data = accumulated[dataset][clustering_type]
+            num_clusters = data["num_clusters"]
+            sizes = data["avg_cluster_size"]
+            distances = data["intra_cluster_distances"]
+            if num_clusters.size:
                 summary[clustering_type][dataset] = {
-                    "avg_num_clusters": np.mean(data["num_clusters"]),
-                    "std_num_clusters": np.std(data["num_clusters"]),
-                    "avg_cluster_size": np.mean(data["avg_cluster_size"]) if data["avg_cluster_size"] else 0,
-                    "std_cluster_size": np.std(data["avg_cluster_size"]) if data["avg_cluster_size"] else 0,
-                    "avg_intra_cluster_distance": np.mean(data["intra_cluster_distances"]) if data["intra_cluster_distances"] else 0,
-                    "std_intra_cluster_distance": np.std(data["intra_cluster_distances"]) if data["intra_cluster_distances"] else 0
+                    "avg_num_clusters": num_clusters.mean(),
+                    "std_num_clusters": num_clusters.std(),
+                    "avg_cluster_size": sizes.mean() if sizes.size else 0,
+                    "std_cluster_size": sizes.std() if sizes.size else 0,
+                    "avg_intra_cluster_distance": distances.mean() if distances.size else 0,
+                    "std_intra_cluster_distance": distances.std() if distances.size else 0
                 }
             else:
                 summary[clustering_type][dataset] = {"no_data": True}
@@ -277,7 +307,7 @@ def create_eval_comparison(custom_detailed: List[Dict], human_detailed: List[Dic
     """Create comparative analysis focusing only on utils/eval.py metrics."""
 
     comparison_results = {
-        "analysis_timestamp": pd.Timestamp.now().isoformat(),
+        "analysis_timestamp": datetime.now().isoformat(),
         "datasets": {
             "custom": {
                 "count": len(custom_detailed) if custom_detailed else 0,
@@ -304,23 +334,26 @@ def create_eval_comparison(custom_detailed: List[Dict], human_detailed: List[Dic
         datasets_with_data.append(("random", random_detailed))
     
     if len(datasets_with_data) >= 2:
+        # Walk each dataset once for the stroke, hue entropy, spatial and clustering metrics
+        accumulated = _accumulate_datasets(custom_detailed, human_detailed, random_detailed)
+
         # Basic stroke count comparison
         stroke_comparison = {}
         for dataset_name, dataset in datasets_with_data:
-            strokes = [r["total_strokes"] for r in dataset]
-            stroke_comparison[f"{dataset_name}_mean"] = np.mean(strokes)
-            stroke_comparison[f"{dataset_name}_std"] = np.std(strokes)
+            strokes = accumulated[dataset_name]["strokes"]
+            stroke_comparison[f"{dataset_name}_mean"] = strokes.mean()
+            stroke_comparison[f"{dataset_name}_std"] = strokes.std()
         
         comparison_results["stroke_count_comparison"] = stroke_comparison
         
         # Spatial correlation comparison
         comparison_results["spatial_correlation_comparison"] = analyze_spatial_correlation_comparison(
-            custom_detailed, human_detailed, random_detailed
+            custom_detailed, human_detailed, random_detailed, accumulated
         )
 
         # Clustering comparison
         comparison_results["clustering_comparison"] = analyze_clustering_comparison(
-            custom_detailed, human_detailed, random_detailed
+            custom_detailed, human_detailed, random_detailed, accumulated
         )
         
         # Temporal correlation comparison
@@ -335,12 +368,12 @@ def create_eval_comparison(custom_detailed: List[Dict], human_detailed: List[Dic
         
         # For custom: check both stroke results (old format) and separate image analysis (new format)
         if custom_detailed:
-            custom_entropies = [r.get("hue_entropy") for r in custom_detailed if r.get("hue_entropy") is not None]
-            if custom_entropies:
+            custom_entropies = accumulated["custom"]["hue_entropies"]
+            if custom_entropies.size:
                 hue_entropy_stats["custom"] = {
-                    "mean": np.mean(custom_entropies),
-                    "std": np.std(custom_entropies),
-                    "count": len(custom_entropies)
+                    "mean": custom_entropies.mean(),
+                    "std": custom_entropies.std(),
+                    "count": custom_entropies.size
                 }
             elif custom_images:
                 custom_entropies = [r.get("hue_entropy") for r in custom_images if r.get("hue_entropy") is not None]
@@ -376,8 +409,7 @@ def create_eval_comparison(custom_detailed: List[Dict], human_detailed: List[Dic
     
     # Save comparative analysis
     comparison_file = os.path.join(output_dir, "eval_comparison.json")
-    with open(comparison_file, 'w') as f:
-        json.dump(comparison_results, f, indent=2)
+    _dump_json_file(comparison_results, comparison_file)
 
     print(f"Eval-focused comparison saved to: {comparison_file}")
 
@@ -479,10 +511,18 @@ def print_eval_summary(comparison_results: Dict[str, Any]):
 
 def main():
     """Main function to run eval-focused analysis."""
+    parser = argparse.ArgumentParser(description="Run the unified analysis and compare eval metrics across datasets.")
+    parser.add_argument('--rerun-evals', action='store_true',
+                        help="Also regenerate the custom and human eval results, in parallel with the unified analysis")
+    args = parser.parse_args()
+
     output_dir = "../output/stats"
     
-    # Run unified analysis script
-    success = run_unified_analysis()
+    if args.rerun_evals:
+        success = run_analysis_scripts()
+    else:
+        # Run unified analysis script
+        success = run_unified_analysis()
     
     if not success:
         print("Unified analysis failed. Exiting.")
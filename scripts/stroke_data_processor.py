@@ -21,7 +21,7 @@ The stroke data format is:
 import json
 import matplotlib.pyplot as plt
 import numpy as np
-from pathlib import Path
+import os
 
 
 def load_stroke_data(filepath):
@@ -113,8 +113,10 @@ def convert_to_agent_format(stroke_data):
 
 def main():
     """Main function to demonstrate usage."""
-    # Look for stroke data files in the current directory
-    stroke_files = list(Path('.').glob('strokes_*.json'))
+    # Look for stroke data files in the current directory (one scandir pass, no Path objects)
+    with os.scandir('.') as entries:
+        stroke_files = [entry for entry in entries
+                        if entry.name.startswith('strokes_') and entry.name.endswith('.json') and entry.is_file()]
     
     if not stroke_files:
         print("No stroke data files found.")
@@ -122,7 +124,9 @@ def main():
         return
     
     # Use the most recent file
-    latest_file = max(stroke_files, key=lambda p: p.stat().st_mtime)
+    latest_entry = max(stroke_files, key=lambda entry: entry.stat().st_mtime)
+    latest_file = latest_entry.name
+    latest_stem = os.path.splitext(latest_file)[0]
     print(f"Loading stroke data from: {latest_file}")
     
     # Load and analyze the data
@@ -130,12 +134,12 @@ def main():
     analyze_strokes(stroke_data)
     
     # Visualize the strokes
-    vis_path = latest_file.stem + '_visualization.png'
+    vis_path = latest_stem + '_visualization.png'
     visualize_strokes(stroke_data, vis_path)
     
     # Convert to agent format (already in correct format)
     agent_format = convert_to_agent_format(stroke_data)
-    agent_file = latest_file.stem + '_agent_format.json'
+    agent_file = latest_stem + '_agent_format.json'
     
     with open(agent_file, 'w') as f:
         json.dump(agent_format, f, indent=2)
@@ -38,12 +38,14 @@ def filter_directories_after_timestamp(base_dir: str, threshold_timestamp: str)
         print(f"Warning: Directory {base_dir} does not exist")
         return valid_dirs
         
-    for item in os.listdir(base_dir):
-        item_path = os.path.join(base_dir, item)
-        if os.path.isdir(item_path):
-            if len(item) == 15 and '_' in item:  # Format: YYYYMMDD_HHMMSS
-                if item > threshold_timestamp:
-                    valid_dirs.append(item_path)
+    # scandir entries carry the file type, so is_dir() needs no extra stat call on most platforms
+    with os.scandir(base_dir) as entries:
+        for entry in entries:
+            item = entry.name
+            # Check the name first: format is YYYYMMDD_HHMMSS
+            if len(item) == 15 and '_' in item and item > threshold_timestamp:
+                if entry.is_dir():
+                    valid_dirs.append(entry.path)
     
     return sorted(valid_dirs)
 
@@ -50,22 +50,36 @@ custom_folders = glob.glob("../output/mood/20250801_*")  # Match folders startin
 os.makedirs("../output/mood/img", exist_ok=True)
 os.makedirs("../output/mood/json", exist_ok=True)
 
-for folder in custom_folders:
+def organize_folder(folder):
+    """Copy one session folder's PNG and JSON files into the img and json directories"""
     # Skip if this is the img or json folder itself
     if folder.endswith('/img') or folder.endswith('/json'):
-        continue
+        return
         
-    # Find all PNG and JSON files in this folder
-    png_files = glob.glob(os.path.join(folder, "*.png"))
-    json_files = glob.glob(os.path.join(folder, "*.json"))
+    # Find all PNG and JSON files in this folder with a single directory pass
+    png_files = []
+    json_files = []
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            if entry.name.endswith(".png"):
+                png_files.append(entry)
+            elif entry.name.endswith(".json"):
+                json_files.append(entry)
     
+    # Only the contents matter for the organized copies, so copyfile skips copy2's metadata
+    # syscalls and uses the kernel's in-place copy where available
     # Copy PNG files to img directory
     for png in png_files:
-        shutil.copy2(png, "../output/custom/img/")
+        shutil.copyfile(png.path, os.path.join("../output/custom/img", png.name))
         
     # Copy JSON files to json directory  
     for json_file in json_files:
-        shutil.copy2(json_file, "../output/custom/json/")
+        shutil.copyfile(json_file.path, os.path.join("../output/custom/json", json_file.name))
+
+# Folders are processed one at a time: sessions share file names (canvas_step_N.png, ...)
+# and all copies land in the same flat img/json directories
+for folder in custom_folders:
+    organize_folder(folder)
 
 print("Custom session files organized into img and json directories")
 
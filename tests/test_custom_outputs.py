@@ -8,12 +8,15 @@ Focuses only on metrics from utils/eval.py.
 import os
 import json
 import glob
+import hashlib
 from typing import List, Dict, Any
 import numpy as np
 from utils.eval import (
     analyze_spatial_correlation, 
     spatial_grouping_by,
-    compute_hue_entropy
+    compute_hue_entropy,
+    compute_hue_histogram,
+    hue_entropy_from_histogram
 )
 from PIL import Image
 import pandas as pd
@@ -36,13 +39,14 @@ def filter_directories_after_timestamp(base_dir: str, threshold_timestamp: str)
         print(f"Warning: Directory {base_dir} does not exist")
         return valid_dirs
         
-    for item in os.listdir(base_dir):
-        item_path = os.path.join(base_dir, item)
-        if os.path.isdir(item_path):
-            # Extract timestamp from directory name
-            if len(item) == 15 and '_' in item:  # Format: YYYYMMDD_HHMMSS
-                if item > threshold_timestamp:
-                    valid_dirs.append(item_path)
+    # scandir entries carry the file type, so is_dir() needs no extra stat call on most platforms
+    with os.scandir(base_dir) as entries:
+        for entry in entries:
+            item = entry.name
+            # Check the name first: format is YYYYMMDD_HHMMSS
+            if len(item) == 15 and '_' in item and item > threshold_timestamp:
+                if entry.is_dir():
+                    valid_dirs.append(entry.path)
     
     return sorted(valid_dirs)
 
@@ -157,12 +161,14 @@ def run_eval_analysis(strokes: List[Dict[str, Any]], file_id: str) -> Dict[str,
     
     return results
 
-def analyze_image_hue_entropy(image_path: str) -> Dict[str, Any]:
+def analyze_image_hue_entropy(image_path: str, cache_dir: str = None) -> Dict[str, Any]:
     """
     Analyze image using compute_hue_entropy from utils/eval.py.
     
     Args:
         image_path: Path to the image file
+        cache_dir: Optional directory of hue histograms keyed by image content,
+            so unchanged images are not decoded again on later runs
         
     Returns:
         Dictionary containing hue entropy analysis
@@ -171,11 +177,24 @@ def analyze_image_hue_entropy(image_path: str) -> Dict[str, Any]:
     
     if os.path.exists(image_path):
         try:
-            image = Image.open(image_path).convert("RGB")
-            rgb_np = np.array(image)
-            
-            # Compute hue entropy using the function from utils/eval.py
-            entropy = compute_hue_entropy(rgb_np, bins=36)
+            if cache_dir:
+                with open(image_path, 'rb') as f:
+                    digest = hashlib.sha256(f.read()).hexdigest()
+                cache_path = os.path.join(cache_dir, f"{digest}_36.npy")
+                if os.path.exists(cache_path):
+                    hist = np.load(cache_path)
+                else:
+                    image = Image.open(image_path).convert("RGB")
+                    hist = compute_hue_histogram(np.array(image), bins=36)
+                    os.makedirs(cache_dir, exist_ok=True)
+                    np.save(cache_path, hist)
+                entropy = hue_entropy_from_histogram(hist)
+            else:
+                image = Image.open(image_path).convert("RGB")
+                rgb_np = np.array(image)
+                
+                # Compute hue entropy using the function from utils/eval.py
+                entropy = compute_hue_entropy(rgb_np, bins=36)
             image_results["hue_entropy"] = float(entropy)
             image_results["has_image"] = True
             
@@ -197,6 +216,8 @@ def main():
     
     # Create output directory if it doesn't exist
     os.makedirs(output_dir, exist_ok=True)
+    # Hue histograms of previously analyzed images, keyed by image content
+    hue_cache_dir = os.path.join(output_dir, ".hue_cache")
     
     # Get directories to process
     valid_dirs = filter_directories_after_timestamp(base_dir, threshold_timestamp)
@@ -234,7 +255,7 @@ def main():
             
             # Analyze associated image if it exists
             image_path = os.path.join(dir_path, f"{dir_name}.png")
-            image_results = analyze_image_hue_entropy(image_path)
+            image_results = analyze_image_hue_entropy(image_path, cache_dir=hue_cache_dir)
             results.update(image_results)
             
             all_results.append(results)
@@ -0,0 +1,57 @@
+"""
+Checks for how malformed stroke coordinates from the model are handled.
+Run from the repository root: python -m pytest tests/test_stroke_inputs.py
+"""
+
+import pytest
+
+from free_drawing_agent import _clamp_coords, _VECTOR_CLAMP_MIN_POINTS
+
+
+@pytest.mark.parametrize("length", [3, _VECTOR_CLAMP_MIN_POINTS, 20])
+def test_clamp_coords_rejects_null_coordinate(length):
+    """A null coordinate is rejected the same way for short and long strokes"""
+    coords = [100] * length
+    coords[1] = None
+    with pytest.raises(TypeError):
+        _clamp_coords(coords, 850, as_float=True)
+
+
+@pytest.mark.parametrize("length", [3, _VECTOR_CLAMP_MIN_POINTS, 20])
+def test_clamp_coords_float_mode(length):
+    """Float mode clamps to the canvas and returns floats on both paths"""
+    coords = [-5, 10, 900.5] + [42] * (length - 3)
+    clamped = _clamp_coords(coords, 850, as_float=True)
+    assert clamped == [0.0, 10.0, 850.0] + [42.0] * (length - 3)
+    assert all(type(c) is float for c in clamped)
+
+
+def test_clamp_coords_keeps_types():
+    """Without float mode each coordinate keeps its own type"""
+    coords = [1, 2.5, 900, -3] * 3
+    clamped = _clamp_coords(coords, 850)
+    assert clamped == [1, 2.5, 850, 0] * 3
+    assert [type(c) for c in clamped] == [int, float, int, int] * 3
+
+
+class _RecordingDriver:
+    """Stand-in for the Selenium driver that records executed scripts"""
+
+    def __init__(self):
+        self.calls = []
+
+    def execute_script(self, script, *args):
+        self.calls.append(args)
+
+
+def test_continuous_stroke_truncates_mismatched_lengths():
+    """Strokes with more x than y coordinates draw the points that have both"""
+    from drawing_canvas_bridge import DrawingCanvasBridge
+
+    bridge = DrawingCanvasBridge()
+    bridge.driver = _RecordingDriver()
+    bridge._execute_continuous_stroke([100, 200, 300, 400], [50, 60], step_length=8, step_duration=0,
+                                      brush_type="marker")
+    x_coords, y_coords = bridge.driver.calls[-1][:2]
+    assert x_coords == [100, 200]
+    assert y_coords == [50, 60]
@@ -1,5 +1,6 @@
 import os
 import time
+import numpy as np
 from drawing_canvas_bridge import DrawingCanvasBridge
 
 # Define the shapes (base positions)
@@ -30,6 +31,12 @@ shapes = [
 x_offsets = [100, 300, 500, 650]
 y_offset = 150
 
+# The offsets are fixed, so place every shape once instead of on every test iteration
+placed_shapes = [
+    ((np.asarray(shape["x"]) + x_offset).tolist(), (np.asarray(shape["y"]) + y_offset).tolist())
+    for shape, x_offset in zip(shapes, x_offsets)
+]
+
 step_lengths = [i * 4 for i in range(10)]      # 0, 4, 8, ..., 36
 step_durations = [i * 10 for i in range(10)]   # 0, 10, 20, ..., 90
 
@@ -47,10 +54,7 @@ def test_draw(step_lengths, step_durations, brush_type):
         step_length = step_lengths[i]
         step_duration = step_durations[i]
         bridge.clear_canvas()
-        for shape, x_offset in zip(shapes, x_offsets):
-            # Offset the shape horizontally and vertically
-            x = [xi + x_offset for xi in shape["x"]]
-            y = [yi + y_offset for yi in shape["y"]]
+        for x, y in placed_shapes:
             draw_stroke_js(bridge, x, y, step_length, step_duration, brush_type)
             # time.sleep(3)
         time.sleep(1.2)
@@ -107,18 +107,17 @@ def get_color_group(hex_color: str) -> str:
 # Modified Analysis Functions
 # ==================================================
 
-def compute_hue_entropy(rgb_image: np.ndarray, bins: int = 36):
+def compute_hue_histogram(rgb_image: np.ndarray, bins: int = 36):
     """
-    Compute the entropy of the hue distribution from an RGB image.
+    Compute the histogram of hues in an RGB image.
 
     Parameters:
         rgb_image (np.ndarray): Input image in RGB format (H, W, 3)
         bins (int): Number of bins for hue histogram (default 36 for 10-degree bins)
 
     Returns:
-        float: Hue entropy (in bits)
+        np.ndarray: Pixel counts per hue bin over 0-360 degrees
     """
-    print(rgb_image.shape)
     # Convert RGB to HSV
     hsv_image = cv2.cvtColor(rgb_image, cv2.COLOR_RGB2HSV)
     hue = hsv_image[:, :, 0]  # Hue channel (0 to 179 in OpenCV)
@@ -128,7 +127,18 @@ def compute_hue_entropy(rgb_image: np.ndarray, bins: int = 36):
 
     # Compute histogram of hue
     hist, _ = np.histogram(hue_deg, bins=bins, range=(0, 360))
+    return hist
+
+def hue_entropy_from_histogram(hist: np.ndarray):
+    """
+    Compute the entropy (in bits) of a hue histogram.
 
+    Parameters:
+        hist (np.ndarray): Pixel counts per hue bin
+
+    Returns:
+        float: Hue entropy (in bits)
+    """
     # Normalize to probability distribution
     prob = hist / np.sum(hist)
 
@@ -137,6 +147,20 @@ def compute_hue_entropy(rgb_image: np.ndarray, bins: int = 36):
 
     return entropy
 
+def compute_hue_entropy(rgb_image: np.ndarray, bins: int = 36):
+    """
+    Compute the entropy of the hue distribution from an RGB image.
+
+    Parameters:
+        rgb_image (np.ndarray): Input image in RGB format (H, W, 3)
+        bins (int): Number of bins for hue histogram (default 36 for 10-degree bins)
+
+    Returns:
+        float: Hue entropy (in bits)
+    """
+    print(rgb_image.shape)
+    return hue_entropy_from_histogram(compute_hue_histogram(rgb_image, bins))
+
 #calculate spatial correlation using frechet distance
 from frechetdist import frdist
 import numpy as np